@@ -3,5 +3,6 @@ Alert modules for trading bot.
 """
 
 from .discord_alerts import DiscordAlerts, send_alert
+from .async_alerts import AsyncDiscordAlerts
 
-__all__ = ['DiscordAlerts', 'send_alert']
+__all__ = ['DiscordAlerts', 'AsyncDiscordAlerts', 'send_alert']
@@ -0,0 +1,133 @@
+"""
+Non-blocking Discord Alerts
+
+Queues alerts and posts them from a background worker thread so the
+trading loop never waits on a Discord round-trip.
+"""
+
+import queue
+import threading
+import time
+from typing import Optional, Dict, Any, List
+
+from .discord_alerts import DiscordAlerts
+
+# Queued by close() to stop the worker
+_STOP = object()
+
+
+class AsyncDiscordAlerts(DiscordAlerts):
+    """
+    Fire-and-forget variant of DiscordAlerts.
+
+    The send_* methods only enqueue the alert and return immediately;
+    a daemon worker drains the queue through the shared keep-alive session.
+    Signals queued in a burst are coalesced into multi-embed posts.
+    """
+
+    COALESCE_WINDOW = 0.2  # Seconds to wait for more signals before posting a batch
+
+    def __init__(self, webhook_url: Optional[str] = None, max_pending: int = 1000):
+        """
+        Args:
+            webhook_url: Discord webhook URL. Falls back to DISCORD_WEBHOOK_URL env var.
+            max_pending: Alerts held in the queue before new ones are dropped.
+        """
+        super().__init__(webhook_url)
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._worker = threading.Thread(target=self._drain, name='discord-alerts', daemon=True)
+        self._worker.start()
+
+    def _drain(self):
+        """Worker loop: post queued alerts until the stop sentinel arrives."""
+        job = self._queue.get()
+        while job is not _STOP:
+            send, args = job
+            taken = 1
+            next_job = None
+            try:
+                if send is DiscordAlerts.send_signal:
+                    next_job, signals = self._coalesce_signals(args[0])
+                    taken = len(signals)
+                    DiscordAlerts.send_batch(self, signals)
+                else:
+                    send(self, *args)
+            except Exception as e:
+                print(f"❌ Error sending queued alert: {e}")
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+
+            job = next_job if next_job is not None else self._queue.get()
+
+        self._queue.task_done()
+
+    def _coalesce_signals(self, first: Dict[str, Any]) -> tuple:
+        """
+        Collect signals queued right behind `first`, up to MAX_EMBEDS.
+
+        Returns:
+            (next_job, signals) where next_job is a dequeued non-signal job
+            still to be processed, else None.
+        """
+        signals = [first]
+        while len(signals) < self.MAX_EMBEDS:
+            try:
+                job = self._queue.get(timeout=self.COALESCE_WINDOW)
+            except queue.Empty:
+                break
+            if job is _STOP or job[0] is not DiscordAlerts.send_signal:
+                return job, signals
+            signals.append(job[1][0])
+        return None, signals
+
+    def _enqueue(self, send, *args) -> bool:
+        """Queue a send call without blocking. Returns False if it was dropped."""
+        if not self.webhook_url:
+            return False
+        try:
+            self._queue.put_nowait((send, args))
+            return True
+        except queue.Full:
+            print("⚠️  Discord alert queue full, dropping alert")
+            return False
+
+    def send_signal(self, signal: Dict[str, Any]) -> bool:
+        """Queue a trading signal. Returns True once queued."""
+        return self._enqueue(DiscordAlerts.send_signal, signal)
+
+    def send_batch(self, signals: List[Dict[str, Any]]) -> int:
+        """Queue several signals; the worker posts them together. Returns the number queued."""
+        return sum(self.send_signal(signal) for signal in signals)
+
+    def send_status_update(self, balance: float, open_positions: int, total_trades: int) -> bool:
+        """Queue a status update embed."""
+        return self._enqueue(DiscordAlerts.send_status_update, balance, open_positions, total_trades)
+
+    def send_trade_closed(self, symbol: str, side: str, entry: float, exit: float, pnl: float) -> bool:
+        """Queue a trade closed notification."""
+        return self._enqueue(DiscordAlerts.send_trade_closed, symbol, side, entry, exit, pnl)
+
+    def flush(self):
+        """Block until every queued alert has been posted."""
+        self._queue.join()
+
+    def close(self, timeout: float = 10.0):
+        """
+        Post pending alerts, stop the worker and release the connection.
+
+        Waits at most `timeout` seconds in total; alerts still queued after
+        that are dropped.
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._worker.join(max(0.0, deadline - time.monotonic()))
+
+        if self._worker.is_alive():
+            with self._queue.mutex:
+                dropped = sum(job is not _STOP for job in self._queue.queue)
+            print(f"⚠️  Discord alerts not sent within {timeout:g}s, dropping {dropped} queued alert(s)")
+        super().close()
@@ -6,14 +6,76 @@ Posts trading signals to Discord channels via webhook.
 
 import os
 import json
+import random
+import threading
+import time
+from collections import deque
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+
+# Static payload fragments shared by every webhook post
+_USERNAME = "SodaPoppy Trading Bot"
+_AVATAR_URL = "https://em-content.zobj.net/source/twitter/376/cup-with-straw_1f964.png"
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Embed formatters, parsed once instead of per alert
+_USD = "${:,.2f}".format
+_STR = "{}".format
+_SIGNAL_TITLE = "{} {} - {}".format
+_SIGNAL_FOOTER = "🥤 SodaPoppy Trading Bot • {}".format
+_FOOTER = "🥤 SodaPoppy • {}".format
+_TRADE_CLOSED_TITLE = "{} Trade Closed - {}".format
+_PNL = "${:,.2f} ({:+.2f}%)".format
+
+# Optional signal keys rendered as extra embed fields: (key, field name, formatter)
+_OPTIONAL_SIGNAL_FIELDS = (
+    ('stop_loss', "🛑 Stop Loss", _USD),
+    ('take_profit', "💎 Take Profit", _USD),
+    ('confidence', "🎯 Confidence", "{}%".format),
+)
+
+# Discord allows 5 webhook posts per 2 seconds, bucketed per webhook URL
+WEBHOOK_RATE_LIMIT = 5
+WEBHOOK_RATE_WINDOW = 2.0
+
+_buckets: Dict[str, Tuple[threading.Lock, deque]] = {}
+_buckets_lock = threading.Lock()
+
+
+def _acquire_webhook_slot(webhook_url: str):
+    """Block until the webhook's rate-limit bucket has room, then claim a slot."""
+    with _buckets_lock:
+        lock, bucket = _buckets.setdefault(webhook_url, (threading.Lock(), deque()))
+    
+    with lock:
+        while True:
+            now = time.monotonic()
+            while bucket and now - bucket[0] >= WEBHOOK_RATE_WINDOW:
+                bucket.popleft()
+            if len(bucket) < WEBHOOK_RATE_LIMIT:
+                bucket.append(now)
+                return
+            time.sleep(WEBHOOK_RATE_WINDOW - (now - bucket[0]))
 
 
 class DiscordAlerts:
     """Send trading alerts to Discord via webhook."""
     
+    MAX_ATTEMPTS = 5
+    MAX_EMBEDS = 10  # Discord's per-message embed limit
+    
     def __init__(self, webhook_url: Optional[str] = None):
         """
         Initialize Discord alerter.
@@ -22,63 +84,93 @@ class DiscordAlerts:
             webhook_url: Discord webhook URL. Falls back to DISCORD_WEBHOOK_URL env var.
         """
         self.webhook_url = webhook_url or os.getenv('DISCORD_WEBHOOK_URL')
-        self.history = []
         
-    def _format_signal(self, signal: Dict[str, Any]) -> Dict[str, Any]:
-        """Format signal as Discord embed."""
+        # Recently sent signals as (symbol, price, sent_at) tuples, oldest evicted first
+        self.history = deque(maxlen=int(os.getenv('ALERT_HISTORY_SIZE', '1000')))
         
-        is_long = signal.get('side', '').upper() in ['LONG', 'BUY']
-        color = 0x00ff00 if is_long else 0xff0000  # Green for long, red for short
-        emoji = "🟢" if is_long else "🔴"
+        # Reuse one keep-alive connection for every webhook POST
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        self.session.headers.update({'Content-Type': 'application/json'})
         
-        embed = {
-            "title": f"{emoji} {signal.get('side', 'SIGNAL').upper()} - {signal.get('symbol', 'UNKNOWN')}",
-            "color": color,
-            "fields": [
-                {
-                    "name": "💰 Price",
-                    "value": f"${signal.get('price', 0):,.2f}",
-                    "inline": True
-                },
-                {
-                    "name": "📊 RSI",
-                    "value": f"{signal.get('rsi', 'N/A')}",
-                    "inline": True
-                },
-                {
-                    "name": "📈 Strategy",
-                    "value": signal.get('strategy', 'Mean Reversion'),
-                    "inline": True
-                }
-            ],
+        # Earliest time (monotonic) Discord allows the next POST
+        self._next_allowed_ts = 0.0
+        
+    def _post_with_retry(self, payload: Dict[str, Any]) -> Optional[requests.Response]:
+        """
+        POST a payload to the webhook, honouring Discord rate limits.
+        
+        On 429 waits for Discord's retry_after (plus jitter) and retries;
+        on 5xx backs off exponentially. Returns the last response, or None
+        if the request could not be sent at all.
+        """
+        response = None
+        for attempt in range(self.MAX_ATTEMPTS):
+            wait = self._next_allowed_ts - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            _acquire_webhook_slot(self.webhook_url)
+            
+            try:
+                response = self.session.post(self.webhook_url, data=_dumps(payload), timeout=10)
+            except Exception as e:
+                print(f"❌ Error sending to Discord: {e}")
+                return None
+            
+            # Bucket exhausted: hold off further sends until it resets
+            if response.headers.get('X-RateLimit-Remaining') == '0':
+                reset_after = float(response.headers.get('X-RateLimit-Reset-After', 0))
+                self._next_allowed_ts = time.monotonic() + reset_after
+            
+            if response.status_code == 429:
+                try:
+                    retry_after = float(response.json().get('retry_after', 1))
+                except ValueError:
+                    retry_after = 1.0
+                self._next_allowed_ts = time.monotonic() + retry_after + random.uniform(0, 5)
+            elif response.status_code >= 500:
+                if attempt < self.MAX_ATTEMPTS - 1:
+                    time.sleep(min(60, 2 ** attempt) + random.random())
+            else:
+                return response
+        
+        return response
+    
+    def _format_signal(self, signal: Dict[str, Any], _now_str: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Format signal as Discord embed.
+        
+        Args:
+            signal: Signal dict, as accepted by send_signal.
+            _now_str: Footer timestamp to reuse across a batch; defaults to now.
+        """
+        
+        side = signal.get('side', '').upper()
+        is_long = side in ('LONG', 'BUY')
+        
+        fields = [
+            {"name": "💰 Price", "value": _USD(signal.get('price', 0)), "inline": True},
+            {"name": "📊 RSI", "value": _STR(signal.get('rsi', 'N/A')), "inline": True},
+            {"name": "📈 Strategy", "value": signal.get('strategy', 'Mean Reversion'), "inline": True},
+        ]
+        
+        # Add optional fields
+        for key, name, fmt in _OPTIONAL_SIGNAL_FIELDS:
+            if key in signal:
+                fields.append({"name": name, "value": fmt(signal[key]), "inline": True})
+        
+        return {
+            "title": _SIGNAL_TITLE(
+                "🟢" if is_long else "🔴",
+                signal.get('side', 'SIGNAL').upper(),
+                signal.get('symbol', 'UNKNOWN')
+            ),
+            "color": 0x00ff00 if is_long else 0xff0000,  # Green for long, red for short
+            "fields": fields,
             "footer": {
-                "text": f"🥤 SodaPoppy Trading Bot • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                "text": _SIGNAL_FOOTER(_now_str or datetime.now().strftime(_TIMESTAMP_FORMAT))
             }
         }
-        
-        # Add optional fields
-        if 'stop_loss' in signal:
-            embed['fields'].append({
-                "name": "🛑 Stop Loss",
-                "value": f"${signal['stop_loss']:,.2f}",
-                "inline": True
-            })
-        
-        if 'take_profit' in signal:
-            embed['fields'].append({
-                "name": "💎 Take Profit",
-                "value": f"${signal['take_profit']:,.2f}",
-                "inline": True
-            })
-        
-        if 'confidence' in signal:
-            embed['fields'].append({
-                "name": "🎯 Confidence",
-                "value": f"{signal['confidence']}%",
-                "inline": True
-            })
-        
-        return embed
     
     def send_signal(self, signal: Dict[str, Any]) -> bool:
         """
@@ -97,32 +189,61 @@ class DiscordAlerts:
         embed = self._format_signal(signal)
         
         payload = {
-            "username": "SodaPoppy Trading Bot",
-            "avatar_url": "https://em-content.zobj.net/source/twitter/376/cup-with-straw_1f964.png",
+            "username": _USERNAME,
+            "avatar_url": _AVATAR_URL,
             "embeds": [embed]
         }
         
-        try:
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                headers={'Content-Type': 'application/json'}
-            )
+        response = self._post_with_retry(payload)
+        if response is None:
+            return False
+        
+        if response.status_code in [200, 204]:
+            self.history.append((signal.get('symbol'), signal.get('price'), time.time()))
+            return True
+        else:
+            print(f"❌ Discord webhook error: {response.status_code} - {response.text}")
+            return False
+    
+    def send_batch(self, signals: List[Dict[str, Any]]) -> int:
+        """
+        Send several trading signals, packing up to MAX_EMBEDS into each POST.
+        
+        Args:
+            signals: List of signal dicts, as accepted by send_signal.
+        
+        Returns:
+            Number of signals delivered.
+        """
+        if not self.webhook_url:
+            print("⚠️  No Discord webhook URL configured")
+            return 0
+        
+        # One footer timestamp for the whole batch
+        now_str = datetime.now().strftime(_TIMESTAMP_FORMAT)
+        
+        sent = 0
+        for start in range(0, len(signals), self.MAX_EMBEDS):
+            chunk = signals[start:start + self.MAX_EMBEDS]
+            payload = {
+                "username": _USERNAME,
+                "avatar_url": _AVATAR_URL,
+                "embeds": [self._format_signal(signal, now_str) for signal in chunk]
+            }
+            
+            response = self._post_with_retry(payload)
+            if response is None:
+                continue
             
             if response.status_code in [200, 204]:
-                self.history.append({
-                    **signal,
-                    'sent_at': datetime.now().isoformat(),
-                    'status': 'sent'
-                })
-                return True
+                sent_at = time.time()
+                for signal in chunk:
+                    self.history.append((signal.get('symbol'), signal.get('price'), sent_at))
+                sent += len(chunk)
             else:
                 print(f"❌ Discord webhook error: {response.status_code} - {response.text}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Error sending to Discord: {e}")
-            return False
+        
+        return sent
     
     def send_status_update(self, balance: float, open_positions: int, total_trades: int) -> bool:
         """Send a status update embed."""
@@ -135,7 +256,7 @@ class DiscordAlerts:
             "fields": [
                 {
                     "name": "💰 Balance",
-                    "value": f"${balance:,.2f}",
+                    "value": _USD(balance),
                     "inline": True
                 },
                 {
@@ -150,20 +271,17 @@ class DiscordAlerts:
                 }
             ],
             "footer": {
-                "text": f"🥤 SodaPoppy • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                "text": _FOOTER(datetime.now().strftime(_TIMESTAMP_FORMAT))
             }
         }
         
         payload = {
-            "username": "SodaPoppy Trading Bot",
+            "username": _USERNAME,
             "embeds": [embed]
         }
         
-        try:
-            response = requests.post(self.webhook_url, json=payload)
-            return response.status_code in [200, 204]
-        except:
-            return False
+        response = self._post_with_retry(payload)
+        return response is not None and response.status_code in [200, 204]
     
     def send_trade_closed(self, symbol: str, side: str, entry: float, exit: float, pnl: float) -> bool:
         """Send trade closed notification."""
@@ -178,26 +296,27 @@ class DiscordAlerts:
             pnl_pct = -pnl_pct
         
         embed = {
-            "title": f"{emoji} Trade Closed - {symbol}",
+            "title": _TRADE_CLOSED_TITLE(emoji, symbol),
             "color": color,
             "fields": [
                 {"name": "Side", "value": side.upper(), "inline": True},
-                {"name": "Entry", "value": f"${entry:,.2f}", "inline": True},
-                {"name": "Exit", "value": f"${exit:,.2f}", "inline": True},
-                {"name": "PnL", "value": f"${pnl:,.2f} ({pnl_pct:+.2f}%)", "inline": True}
+                {"name": "Entry", "value": _USD(entry), "inline": True},
+                {"name": "Exit", "value": _USD(exit), "inline": True},
+                {"name": "PnL", "value": _PNL(pnl, pnl_pct), "inline": True}
             ],
             "footer": {
-                "text": f"🥤 SodaPoppy • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                "text": _FOOTER(datetime.now().strftime(_TIMESTAMP_FORMAT))
             }
         }
         
-        payload = {"username": "SodaPoppy Trading Bot", "embeds": [embed]}
+        payload = {"username": _USERNAME, "embeds": [embed]}
         
-        try:
-            response = requests.post(self.webhook_url, json=payload)
-            return response.status_code in [200, 204]
-        except:
-            return False
+        response = self._post_with_retry(payload)
+        return response is not None and response.status_code in [200, 204]
+
+    def close(self):
+        """Release the pooled webhook connection."""
+        self.session.close()
 
 
 # Convenience function for quick alerts
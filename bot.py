@@ -12,21 +12,47 @@ Usage:
 """
 
 import argparse
+import atexit
+import hashlib
 import json
 import os
+import signal as os_signal
+import socket
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any
+from itertools import chain
+from types import MappingProxyType
+from typing import Dict, Any, List
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import numpy as np
 
-from signal_engine import SignalEngine, SignalType, CompositeSignal
-from alerts.discord_alerts import DiscordAlerts
+try:
+    import orjson
+    
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None).encode()
+    
+    _loads = json.loads
 
+from signal_engine import SignalEngine, SignalType, CompositeSignal, LONG_SIGNALS
+from alerts.async_alerts import AsyncDiscordAlerts
+from config.kraken import RATE_LIMITS
+from data_sources._cache import CACHE_DIR, load_array, save_array
 
-# Kraken pair mapping
-PAIR_MAP = {
+
+# Kraken pair mapping (read-only)
+PAIR_MAP = MappingProxyType({
     'BTC': 'XXBTZUSD',
     'ETH': 'XETHZUSD',
     'SOL': 'SOLUSD',
@@ -35,6 +61,51 @@ PAIR_MAP = {
     'DOGE': 'XDGUSD',
     'DOT': 'DOTUSD',
     'LINK': 'LINKUSD',
+})
+
+STATE_FILE = 'bot_state.json'
+TRADES_LOG = 'trades.jsonl'  # Append-only record of every closed trade
+
+# Local candle history, so each fetch only downloads new bars
+MAX_CACHED_CANDLES = 720  # Kraken's OHLC page size
+
+# Concurrent Kraken candle fetches per scan
+FETCH_WORKERS = 4
+
+
+class _RateLimiter:
+    """Token bucket: up to `burst` calls at once, refilled at `rate` calls per second."""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a call is allowed, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Kraken public API budget, shared by every fetch in the process
+_KRAKEN_LIMITER = _RateLimiter(RATE_LIMITS['public']['calls_per_second'], FETCH_WORKERS)
+
+SIGNAL_EMOJI = {
+    SignalType.STRONG_LONG: "🟢🟢",
+    SignalType.LONG: "🟢",
+    SignalType.NEUTRAL: "⚪",
+    SignalType.SHORT: "🔴",
+    SignalType.STRONG_SHORT: "🔴🔴"
 }
 
 
@@ -59,7 +130,25 @@ class TradingBot:
         
         # Components
         self.signal_engine = SignalEngine()
-        self.alerter = DiscordAlerts(webhook_url) if enable_alerts else None
+        
+        # Result key Kraken uses for each pair (e.g. BTC -> XXBTZUSD)
+        self._kraken_keys: Dict[str, str] = {}
+        
+        # Candle history per (pair, interval), topped up incrementally
+        self._candles: Dict[tuple, np.ndarray] = {}
+        
+        # Last analysis per pair, reused while the latest candle is unchanged
+        self._signal_cache: Dict[str, tuple] = {}
+        self.alerter = AsyncDiscordAlerts(webhook_url) if enable_alerts else None
+        
+        # Keep-alive connections to Kraken, shared by the concurrent fetch threads
+        self._session = requests.Session()
+        self._session.headers.update({'User-Agent': 'SodaPoppy/1.0'})
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=FETCH_WORKERS,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        ))
         
         # State
         self.state = {
@@ -67,17 +156,21 @@ class TradingBot:
             'positions': {},
             'trades': [],
             'signals_generated': 0,
-            'start_time': datetime.now().isoformat()
+            'start_time': int(time.time())
         }
         
         # Load existing state if available
         self._load_state()
+        
+        # State is written once per scan (and on exit) rather than on every change
+        self._dirty = False
+        atexit.register(self._flush_state)
     
     def _load_state(self):
         """Load state from file if exists."""
         try:
-            with open('bot_state.json', 'r') as f:
-                saved = json.load(f)
+            with open(STATE_FILE, 'rb') as f:
+                saved = _loads(f.read())
                 self.state['balance'] = saved.get('balance', self.starting_balance)
                 self.state['positions'] = saved.get('positions', {})
                 self.state['trades'] = saved.get('trades', [])
@@ -85,44 +178,177 @@ class TradingBot:
             pass
     
     def _save_state(self):
-        """Save state to file."""
-        with open('bot_state.json', 'w') as f:
-            json.dump(self.state, f, indent=2)
+        """Save state to file (written aside, then renamed so a crash can't truncate it)."""
+        tmp_path = STATE_FILE + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_dumps(self.state, indent=True))
+        os.replace(tmp_path, STATE_FILE)
+    
+    def _flush_state(self):
+        """Save state if it changed since the last save."""
+        if self._dirty:
+            self._save_state()
+            self._dirty = False
+    
+    def _log_trade(self, trade: Dict[str, Any]):
+        """Append one closed trade to the trade log."""
+        try:
+            with open(TRADES_LOG, 'ab') as f:
+                f.write(_dumps(trade) + b"\n")
+        except OSError as e:
+            print(f"  ⚠️  Could not log trade: {e}")
+    
+    def _cache_path(self, pair: str, interval: int) -> str:
+        return os.path.join(CACHE_DIR, f"candles_{pair}_{interval}.npy")
+    
+    def _cached_candles(self, pair: str, interval: int):
+        """Candles kept from earlier fetches (memory, then disk), or None."""
+        key = (pair, interval)
+        if key not in self._candles:
+            self._candles[key] = load_array(self._cache_path(pair, interval))
+        return self._candles[key]
     
     def fetch_candles(self, pair: str, interval: int = 60, count: int = 100) -> np.ndarray:
-        """Fetch candles from Kraken."""
+        """
+        Fetch candles from Kraken.
+        
+        Only bars newer than the local candle cache are downloaded; they are
+        merged into the cached history, which is persisted for the next run.
+        """
         kraken_pair = PAIR_MAP.get(pair, pair)
         url = "https://api.kraken.com/0/public/OHLC"
         params = {'pair': kraken_pair, 'interval': interval}
         
+        # Ask from the last closed bar so the still-forming one is always refreshed
+        cached = self._cached_candles(pair, interval)
+        if cached is not None and len(cached) >= 2:
+            params['since'] = int(cached[-2, 0])
+        
         try:
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            _KRAKEN_LIMITER.acquire()
+            response = self._session.get(url, params=params, timeout=10)
+            data = _loads(response.content)
             
             if data.get('error') and len(data['error']) > 0:
                 print(f"  ❌ Kraken error for {pair}: {data['error']}")
                 return None
             
             result = data['result']
-            pair_key = [k for k in result.keys() if k != 'last'][0]
-            candles = result[pair_key][-count:]
+            pair_key = self._kraken_keys.get(pair)
+            if pair_key not in result:
+                pair_key = next(k for k in result if k != 'last')
+                self._kraken_keys[pair] = pair_key
+            candles = result[pair_key]
             
-            return np.array([
-                [float(c[0]), float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[6])]
-                for c in candles
-            ])
+            # [time, open, high, low, close, volume] parsed straight into one float64 buffer
+            fresh = np.fromiter(
+                chain.from_iterable((c[0], c[1], c[2], c[3], c[4], c[6]) for c in candles),
+                dtype=np.float64, count=6 * len(candles)
+            ).reshape(-1, 6)
         except Exception as e:
             print(f"  ❌ Fetch error for {pair}: {e}")
             return None
+        
+        arr = self._merge_candles(cached, fresh, interval)
+        if arr is None:
+            return None
+        
+        if arr is not cached:
+            self._candles[(pair, interval)] = arr
+            save_array(self._cache_path(pair, interval), arr)
+        
+        return arr[-count:]
+    
+    @staticmethod
+    def _merge_candles(cached, fresh: np.ndarray, interval: int):
+        """Append freshly fetched bars to the cached ones, replacing overlaps."""
+        if len(fresh) == 0:
+            return cached
+        
+        # Use the cache only if the new bars continue it without a gap
+        if cached is not None and fresh[0, 0] <= cached[-1, 0] + interval * 60:
+            fresh = np.concatenate((cached[cached[:, 0] < fresh[0, 0]], fresh))
+        
+        return fresh[-MAX_CACHED_CANDLES:]
+    
+    def _analyze(self, pair: str, candles: np.ndarray) -> CompositeSignal:
+        """Run the signal engine, skipping it if the latest candle hasn't changed."""
+        # The last row is the still-forming candle, so compare all of it, not just its time
+        key = candles[-1].tobytes()
+        cached = self._signal_cache.get(pair)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        signal = self.signal_engine.analyze(pair, candles)
+        self._signal_cache[pair] = (key, signal)
+        return signal
+    
+    def _fetch_many(self, pairs: List[str], count: int = 100) -> Dict[str, np.ndarray]:
+        """Fetch candles for several pairs concurrently. Failed fetches map to None."""
+        if not pairs:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(len(pairs), FETCH_WORKERS)) as executor:
+            futures = {pair: executor.submit(self.fetch_candles, pair, count=count) for pair in pairs}
+        return {pair: future.result() for pair, future in futures.items()}
+    
+    def fetch_tickers(self, pairs: List[str]) -> Dict[str, float]:
+        """
+        Fetch last trade prices for several pairs in one Kraken Ticker request.
+        
+        Args:
+            pairs: Trading pairs (e.g., 'BTC', 'ETH')
+        
+        Returns:
+            Dict of pair -> last price; pairs missing from the response are left out
+        """
+        if not pairs:
+            return {}
+        
+        # Ticker results are keyed by Kraken's canonical pair name
+        pair_keys = {}
+        for pair in pairs:
+            pair_keys[self._kraken_keys.get(pair, PAIR_MAP.get(pair, pair))] = pair
+        
+        url = "https://api.kraken.com/0/public/Ticker"
+        params = {'pair': ','.join(PAIR_MAP.get(pair, pair) for pair in pairs)}
+        
+        try:
+            _KRAKEN_LIMITER.acquire()
+            response = self._session.get(url, params=params, timeout=10)
+            data = _loads(response.content)
+            
+            if data.get('error') and len(data['error']) > 0:
+                print(f"  ❌ Kraken ticker error: {data['error']}")
+                return {}
+            
+            return {
+                pair_keys[key]: float(ticker['c'][0])
+                for key, ticker in data['result'].items()
+                if key in pair_keys
+            }
+        except Exception as e:
+            print(f"  ❌ Ticker fetch error: {e}")
+            return {}
     
     def check_exits(self):
         """Check stop loss and take profit for open positions."""
-        for pair, pos in list(self.state['positions'].items()):
-            candles = self.fetch_candles(pair, count=5)
-            if candles is None:
+        positions = list(self.state['positions'].items())
+        prices = self.fetch_tickers([pair for pair, _ in positions])
+        
+        # One bad pair fails the whole Ticker request, so price anything it
+        # missed from that pair's own candles
+        missing = [pair for pair, _ in positions if pair not in prices]
+        for pair, candles in self._fetch_many(missing, count=5).items():
+            if candles is not None and len(candles) > 0:
+                prices[pair] = float(candles[-1, 4])
+        
+        for pair, pos in positions:
+            current_price = prices.get(pair)
+            if current_price is None:
+                print(f"  ⚠️  {pair}: no price, stop loss / take profit not checked this scan")
                 continue
             
-            current_price = candles[-1, 4]
             entry_price = pos['entry_price']
             side = pos['side']
             
@@ -150,11 +376,13 @@ class TradingBot:
         trade_record = {
             **pos,
             'exit_price': exit_price,
-            'exit_time': datetime.now().isoformat(),
+            'exit_time': int(time.time()),
             'pnl': pnl,
             'reason': reason
         }
         self.state['trades'].append(trade_record)
+        self._log_trade({'pair': pair, **trade_record})
+        self._dirty = True
         
         print(f"  📊 Closed {pair}: PnL ${pnl:,.2f} | Balance: ${self.state['balance']:,.2f}")
         
@@ -163,13 +391,11 @@ class TradingBot:
             self.alerter.send_trade_closed(
                 pair, pos['side'], pos['entry_price'], exit_price, pnl
             )
-        
-        self._save_state()
     
     def execute_signal(self, pair: str, signal: CompositeSignal):
         """Execute a trade based on signal."""
         # Only trade on actionable signals with high confidence
-        if signal.signal in [SignalType.NEUTRAL]:
+        if signal.signal is SignalType.NEUTRAL:
             return
         
         if signal.confidence < 65:
@@ -181,10 +407,7 @@ class TradingBot:
             return
         
         # Determine side
-        if signal.signal in [SignalType.LONG, SignalType.STRONG_LONG]:
-            side = 'long'
-        else:
-            side = 'short'
+        side = 'long' if signal.signal in LONG_SIGNALS else 'short'
         
         # Calculate position
         position_value = self.state['balance'] * self.position_size_pct
@@ -195,9 +418,10 @@ class TradingBot:
             'entry_price': signal.price,
             'qty': qty,
             'side': side,
-            'entry_time': datetime.now().isoformat(),
+            'entry_time': int(time.time()),
             'signal_confidence': signal.confidence
         }
+        self._dirty = True
         
         print(f"  🎯 PAPER TRADE: {side.upper()} {pair} @ ${signal.price:,.2f} (qty: {qty:.6f})")
         
@@ -207,8 +431,6 @@ class TradingBot:
             alert_data['stop_loss'] = signal.price * (1 - self.stop_loss_pct) if side == 'long' else signal.price * (1 + self.stop_loss_pct)
             alert_data['take_profit'] = signal.price * (1 + self.take_profit_pct) if side == 'long' else signal.price * (1 - self.take_profit_pct)
             self.alerter.send_signal(alert_data)
-        
-        self._save_state()
     
     def scan(self):
         """Scan all pairs for signals."""
@@ -228,46 +450,70 @@ class TradingBot:
         
         # Scan for new signals
         print("📡 Scanning pairs...")
+        # execute_signal never adds to a held pair, so its signal would be thrown away
+        pair_candles = self._fetch_many([p for p in self.pairs if p not in self.state['positions']])
+        
         for pair in self.pairs:
-            candles = self.fetch_candles(pair)
+            if pair not in pair_candles:
+                print(f"  {pair}/USD: ⏸️  Position open, skipping analysis")
+                continue
+            
+            candles = pair_candles[pair]
             if candles is None:
                 continue
             
-            signal = self.signal_engine.analyze(pair, candles)
+            signal = self._analyze(pair, candles)
             self.state['signals_generated'] += 1
+            self._dirty = True
             
-            signal_emoji = {
-                SignalType.STRONG_LONG: "🟢🟢",
-                SignalType.LONG: "🟢",
-                SignalType.NEUTRAL: "⚪",
-                SignalType.SHORT: "🔴",
-                SignalType.STRONG_SHORT: "🔴🔴"
-            }
-            
-            print(f"  {pair}/USD: ${signal.price:,.2f} {signal_emoji[signal.signal]} {signal.signal.name} ({signal.confidence:.0f}%)")
+            print(f"  {pair}/USD: ${signal.price:,.2f} {SIGNAL_EMOJI[signal.signal]} {signal.signal.name} ({signal.confidence:.0f}%)")
             
             # Execute if actionable
-            if signal.signal != SignalType.NEUTRAL:
+            if signal.signal is not SignalType.NEUTRAL:
                 self.execute_signal(pair, signal)
         
-        self._save_state()
+        self._flush_state()
     
-    def run(self, interval: int = 60):
-        """Main loop."""
+    def run(self, interval: int = 60, phase_offset: float = None):
+        """
+        Main loop.
+        
+        Args:
+            interval: Seconds between scans
+            phase_offset: Seconds to shift the scan schedule by. Defaults to a
+                stable per-host/process value so separate bots don't all hit
+                Kraken on the same second.
+        """
+        if phase_offset is None:
+            phase_offset = _default_phase_offset(interval)
+        
         print("🚀 Starting SodaPoppy Trading Bot")
         print(f"   Pairs: {', '.join(self.pairs)}")
-        print(f"   Check interval: {interval}s")
+        print(f"   Check interval: {interval}s (phase +{phase_offset:.0f}s)")
         print(f"   Alerts: {'ON' if self.alerter else 'OFF'}")
         print()
         
+        # Treat SIGTERM like Ctrl-C so the summary prints and state is flushed
+        os_signal.signal(os_signal.SIGTERM, os_signal.default_int_handler)
+        
         try:
             while True:
                 self.scan()
-                print(f"\n⏳ Next scan in {interval}s...")
-                time.sleep(interval)
+                delay = interval - ((time.time() - phase_offset) % interval)
+                print(f"\n⏳ Next scan in {delay:.0f}s...")
+                time.sleep(delay)
         except KeyboardInterrupt:
             print("\n\n🛑 Bot stopped")
             self._print_summary()
+        finally:
+            self.close()
+    
+    def close(self):
+        """Save pending state, deliver queued alerts and release connections."""
+        self._flush_state()
+        if self.alerter:
+            self.alerter.close()
+        self._session.close()
     
     def _print_summary(self):
         """Print final summary."""
@@ -279,6 +525,7 @@ class TradingBot:
         print(f"\n{'='*60}")
         print("📊 SESSION SUMMARY")
         print(f"{'='*60}")
+        print(f"Started:          {_fmt_ts(self.state['start_time'])}")
         print(f"Starting Balance: ${initial:,.2f}")
         print(f"Final Balance:    ${final:,.2f}")
         print(f"Total PnL:        ${pnl:,.2f} ({pnl_pct:+.2f}%)")
@@ -291,6 +538,17 @@ class TradingBot:
             print(f"Win Rate:         {wins}/{len(self.state['trades'])} ({wins/len(self.state['trades'])*100:.0f}%)")
 
 
+def _fmt_ts(ts: int) -> str:
+    """Format a state timestamp (epoch seconds) for display."""
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _default_phase_offset(interval: int) -> int:
+    """Deterministic offset into the scan interval for this host and process."""
+    digest = hashlib.blake2b(f"{socket.gethostname()}{os.getpid()}".encode(), digest_size=4).hexdigest()
+    return int(digest, 16) % max(int(interval), 1)
+
+
 def main():
     parser = argparse.ArgumentParser(description='SodaPoppy Trading Bot')
     parser.add_argument('--pairs', nargs='+', default=['BTC', 'ETH'], help='Pairs to trade')
@@ -299,6 +557,7 @@ def main():
     parser.add_argument('--live-alerts', action='store_true', help='Enable Discord alerts')
     parser.add_argument('--webhook', type=str, help='Discord webhook URL')
     parser.add_argument('--scan-once', action='store_true', help='Scan once and exit')
+    parser.add_argument('--phase-offset', type=float, help='Seconds to offset the scan schedule (default: per-process)')
     
     args = parser.parse_args()
     
@@ -311,8 +570,9 @@ def main():
     
     if args.scan_once:
         bot.scan()
+        bot.close()
     else:
-        bot.run(interval=args.interval)
+        bot.run(interval=args.interval, phase_offset=args.phase_offset)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,19 @@
+"""
+Optional Numba JIT
+==================
+Hot numeric loops are decorated with ``njit``. When numba is installed they
+compile to native code; without it the decorator is a no-op and the plain
+Python function runs unchanged.
+"""
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -0,0 +1,37 @@
+"""
+Ahead-of-time build of the regime detector's native kernels
+============================================================
+Compiles the Wilder smoothing loop and the fused v2 indicator pass into
+``core/_regime_native`` so deployed bots skip the JIT compile on their
+first scan:
+
+    python -m core._regime_aot
+
+regime_detector and regime_detector_v2 import the compiled module when it
+is present and fall back to the njit (or plain Python) versions otherwise.
+Rebuild after upgrading numba or numpy.
+"""
+
+import os
+
+from numba.pycc import CC
+
+from core.regime_detector import _wilder_smooth, _wilder_smooth_into, _wilder_smooth_last
+from core.regime_detector_v2 import _analyze_all_impl
+
+cc = CC('_regime_native')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.verbose = True
+
+# ADXCalculator smooths float32 buffers by default; float64 for everyone else
+cc.export('wilder_smooth_f4', 'f4[:](f4[:], i8)')(_wilder_smooth)
+cc.export('wilder_smooth_f8', 'f8[:](f8[:], i8)')(_wilder_smooth)
+cc.export('wilder_smooth_into_f4', 'void(f4[:], i8, f4[:])')(_wilder_smooth_into)
+cc.export('wilder_smooth_into_f8', 'void(f8[:], i8, f8[:])')(_wilder_smooth_into)
+cc.export('wilder_smooth_last_f4', 'f4(f4[:], i8)')(_wilder_smooth_last)
+cc.export('wilder_smooth_last_f8', 'f8(f8[:], i8)')(_wilder_smooth_last)
+cc.export('analyze_all', 'UniTuple(f8, 12)(f8[:], f8[:], f8[:], f8[:])')(_analyze_all_impl)
+
+
+if __name__ == '__main__':
+    cc.compile()
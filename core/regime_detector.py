@@ -13,12 +13,80 @@ Based on backtest results (Feb 2026):
 """
 
 import numpy as np
-from typing import Tuple, Literal
+import threading
+from collections import deque
+from typing import Tuple, Literal, Optional
+
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
 
 RegimeType = Literal["BEAR_TREND", "DEFAULT"]
 StrategyType = Literal["RSI_MOMENTUM", "MEAN_REVERSION"]
 
 
+def _wilder_smooth(arr: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing (EMA with alpha = 1/period) seeded with the first
+    `period` values' mean. Entries before the seed are left at 0.
+    """
+    result = np.zeros_like(arr)
+    result[period-1] = np.mean(arr[:period])
+    for i in range(period, len(arr)):
+        result[i] = result[i-1] - (result[i-1] / period) + arr[i]
+    return result
+
+
+def _wilder_smooth_into(arr: np.ndarray, period: int, out: np.ndarray):
+    """wilder_smooth written into a preallocated `out` of the same length."""
+    out[:period-1] = 0
+    out[period-1] = np.mean(arr[:period])
+    for i in range(period, len(arr)):
+        out[i] = out[i-1] - (out[i-1] / period) + arr[i]
+
+
+def _wilder_smooth_last(arr: np.ndarray, period: int) -> float:
+    """Last value of wilder_smooth, without materializing the series."""
+    result = np.mean(arr[:period])
+    for i in range(period, len(arr)):
+        result = result - (result / period) + arr[i]
+    return result
+
+
+try:
+    # Precompiled by `python -m core._regime_aot`; no JIT warm-up on first scan
+    from core._regime_native import (
+        wilder_smooth_f4, wilder_smooth_f8,
+        wilder_smooth_into_f4, wilder_smooth_into_f8,
+        wilder_smooth_last_f4, wilder_smooth_last_f8,
+    )
+    
+    def wilder_smooth(arr: np.ndarray, period: int) -> np.ndarray:
+        """Wilder's smoothing via the ahead-of-time compiled kernels."""
+        if arr.dtype == np.float32:
+            return wilder_smooth_f4(arr, period)
+        return wilder_smooth_f8(np.ascontiguousarray(arr, dtype=np.float64), period)
+    
+    def wilder_smooth_into(arr: np.ndarray, period: int, out: np.ndarray):
+        """wilder_smooth into `out` (same float32/float64 dtype as arr)."""
+        if arr.dtype == np.float32:
+            wilder_smooth_into_f4(arr, period, out)
+        else:
+            wilder_smooth_into_f8(arr, period, out)
+    
+    def wilder_smooth_last(arr: np.ndarray, period: int) -> float:
+        """Last value of wilder_smooth."""
+        if arr.dtype == np.float32:
+            return wilder_smooth_last_f4(arr, period)
+        return wilder_smooth_last_f8(np.ascontiguousarray(arr, dtype=np.float64), period)
+except ImportError:
+    from core._njit import njit
+    wilder_smooth = njit(cache=True)(_wilder_smooth)
+    wilder_smooth_into = njit(cache=True)(_wilder_smooth_into)
+    wilder_smooth_last = njit(cache=True)(_wilder_smooth_last)
+
+
 def calculate_adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> float:
     """
     Calculate Average Directional Index (ADX).
@@ -38,47 +106,279 @@ def calculate_adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period:
     if len(close) < period + 1:
         return 0.0
     
-    # Calculate True Range
-    tr = np.maximum(
-        high[1:] - low[1:],
-        np.maximum(
-            np.abs(high[1:] - close[:-1]),
-            np.abs(low[1:] - close[:-1])
-        )
-    )
+    # One layout for the compiled smoothing loop
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    
+    return _thread_adx()(high, low, close, period)
+
+
+class ADXCalculator:
+    """
+    ADX computed in preallocated scratch buffers.
+    
+    Buffers grow to the longest input seen and are reused on every call,
+    so one instance must not be shared between threads.
+    
+    Prices come in as float64 but the intermediates (ranges, moves, DIs)
+    are stored as float32 by default: ADX is a ratio of smoothed ranges,
+    so single precision is plenty and halves the memory traffic.
+    """
     
-    # Calculate +DM and -DM
-    up_move = high[1:] - high[:-1]
-    down_move = low[:-1] - low[1:]
+    def __init__(self, n_max: int = 1024, dtype: type = np.float32):
+        """
+        Args:
+            n_max: Initial buffer length (bars); grown on demand.
+            dtype: Floating point type of the scratch buffers.
+        """
+        self.dtype = np.dtype(dtype)
+        self._allocate(n_max)
     
-    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
+    def _allocate(self, n_max: int):
+        self._n_max = n_max
+        self._tr = np.empty(n_max, dtype=self.dtype)
+        self._atr = np.empty(n_max, dtype=self.dtype)
+        self._tmp = np.empty(n_max, dtype=self.dtype)
+        self._up_move = np.empty(n_max, dtype=self.dtype)
+        self._down_move = np.empty(n_max, dtype=self.dtype)
+        self._plus_dm = np.empty(n_max, dtype=self.dtype)
+        self._minus_dm = np.empty(n_max, dtype=self.dtype)
+        self._mask = np.empty(n_max, dtype=bool)
+        self._mask2 = np.empty(n_max, dtype=bool)
+        self._plus_di = np.empty(n_max, dtype=self.dtype)
+        self._minus_di = np.empty(n_max, dtype=self.dtype)
+        self._di_sum = np.empty(n_max, dtype=self.dtype)
+        self._dx = np.empty(n_max, dtype=self.dtype)
+    
+    def __call__(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> float:
+        """ADX of contiguous float64 arrays with at least period + 1 bars."""
+        n = len(close) - 1
+        if n > self._n_max:
+            self._allocate(max(n, 2 * self._n_max))
+        
+        tr = self._tr[:n]
+        tmp = self._tmp[:n]
+        up_move = self._up_move[:n]
+        down_move = self._down_move[:n]
+        
+        # Calculate True Range
+        np.subtract(high[1:], low[1:], out=tr)
+        np.subtract(high[1:], close[:-1], out=tmp)
+        np.abs(tmp, out=tmp)
+        np.maximum(tr, tmp, out=tr)
+        np.subtract(low[1:], close[:-1], out=tmp)
+        np.abs(tmp, out=tmp)
+        np.maximum(tr, tmp, out=tr)
+        
+        # Calculate +DM and -DM
+        np.subtract(high[1:], high[:-1], out=up_move)
+        np.subtract(low[:-1], low[1:], out=down_move)
+        
+        mask = self._mask[:n]
+        mask2 = self._mask2[:n]
+        plus_dm = self._plus_dm[:n]
+        minus_dm = self._minus_dm[:n]
+        
+        # Branchless: each move times its (move > other move) & (move > 0) mask
+        np.greater(up_move, down_move, out=mask)
+        np.greater(up_move, 0, out=mask2)
+        mask &= mask2
+        np.multiply(up_move, mask, out=plus_dm)
+        
+        np.greater(down_move, up_move, out=mask)
+        np.greater(down_move, 0, out=mask2)
+        mask &= mask2
+        np.multiply(down_move, mask, out=minus_dm)
+        
+        # Smooth with Wilder's method (EMA with alpha = 1/period), in place
+        atr = self._atr[:n]
+        wilder_smooth_into(tr, period, atr)
+        np.greater(atr, 0, out=mask)
+        
+        # Divides skip (leave undivided) entries whose denominator isn't positive
+        plus_di = self._plus_di[:n]
+        minus_di = self._minus_di[:n]
+        wilder_smooth_into(plus_dm, period, plus_di)
+        np.multiply(plus_di, 100, out=plus_di)
+        np.divide(plus_di, atr, out=plus_di, where=mask)
+        wilder_smooth_into(minus_dm, period, minus_di)
+        np.multiply(minus_di, 100, out=minus_di)
+        np.divide(minus_di, atr, out=minus_di, where=mask)
+        
+        # Calculate DX and ADX
+        di_sum = self._di_sum[:n]
+        dx = self._dx[:n]
+        np.add(plus_di, minus_di, out=di_sum)
+        np.greater(di_sum, 0, out=mask)
+        np.subtract(plus_di, minus_di, out=dx)
+        np.abs(dx, out=dx)
+        np.multiply(dx, 100, out=dx)
+        np.divide(dx, di_sum, out=dx, where=mask)
+        
+        # Only the latest ADX is needed, so the last smoothing keeps a running value
+        return float(wilder_smooth_last(dx, period))
+
+
+# calculate_adx reuses one calculator per thread, since its scratch buffers can't be shared
+_adx_local = threading.local()
+
+
+def _thread_adx() -> ADXCalculator:
+    """The calling thread's ADXCalculator, created on first use."""
+    calc = getattr(_adx_local, 'calc', None)
+    if calc is None:
+        calc = _adx_local.calc = ADXCalculator()
+    return calc
+
+
+class IncrementalADX:
+    """
+    ADX maintained bar by bar: each new bar costs one Wilder step for the
+    ATR, the smoothed +DM/-DM and the ADX instead of a full recompute.
     
-    # Smooth with Wilder's method (EMA with alpha = 1/period)
-    def wilder_smooth(arr, period):
-        result = np.zeros_like(arr)
-        result[period-1] = np.mean(arr[:period])
-        for i in range(period, len(arr)):
-            result[i] = result[i-1] - (result[i-1] / period) + arr[i]
-        return result
+    Feeding every bar of a series through update() gives the same value as
+    calculate_adx() on that series (in float64), so a caller holding a
+    growing candle history only pays for the bars it hasn't seen.
+    """
     
-    atr = wilder_smooth(tr, period)
-    plus_di = 100 * wilder_smooth(plus_dm, period) / np.where(atr > 0, atr, 1)
-    minus_di = 100 * wilder_smooth(minus_dm, period) / np.where(atr > 0, atr, 1)
+    def __init__(self, period: int = 14):
+        """
+        Args:
+            period: Lookback period (default 14)
+        """
+        self.period = period
+        self.n_bars_seen = 0
+        self.atr = 0.0
+        self.plus_dm_smooth = 0.0
+        self.minus_dm_smooth = 0.0
+        self.adx = 0.0
+        self._prev_high = self._prev_low = self._prev_close = 0.0
+        
+    @classmethod
+    def from_history(cls, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> "IncrementalADX":
+        """Build the state from an existing price history."""
+        state = cls(period)
+        for h, l, c in zip(high.tolist(), low.tolist(), close.tolist()):
+            state.update(h, l, c)
+        return state
     
-    # Calculate DX and ADX
-    di_sum = plus_di + minus_di
-    dx = 100 * np.abs(plus_di - minus_di) / np.where(di_sum > 0, di_sum, 1)
-    adx = wilder_smooth(dx, period)
+    @property
+    def ready(self) -> bool:
+        """True once enough bars have been seen for a valid ADX."""
+        return self.n_bars_seen >= self.period + 1
     
-    return float(adx[-1]) if len(adx) > 0 else 0.0
+    def update(self, high: float, low: float, close: float) -> float:
+        """
+        Add one closed bar.
+        
+        Returns:
+            Current ADX value (0.0 until period + 1 bars have been seen)
+        """
+        self.n_bars_seen += 1
+        prev_high, prev_low, prev_close = self._prev_high, self._prev_low, self._prev_close
+        self._prev_high, self._prev_low, self._prev_close = high, low, close
+        if self.n_bars_seen == 1:
+            return 0.0
+        
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        up_move = high - prev_high
+        down_move = prev_low - low
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        
+        period = self.period
+        n = self.n_bars_seen - 1  # TR values seen so far
+        if n < period:
+            # Warm-up: sum the seed window; DX is 0 until the seed is in
+            self.atr += tr
+            self.plus_dm_smooth += plus_dm
+            self.minus_dm_smooth += minus_dm
+            return 0.0
+        
+        if n == period:
+            # Seed with the window mean, as wilder_smooth does
+            self.atr = (self.atr + tr) / period
+            self.plus_dm_smooth = (self.plus_dm_smooth + plus_dm) / period
+            self.minus_dm_smooth = (self.minus_dm_smooth + minus_dm) / period
+        else:
+            self.atr = self.atr - self.atr / period + tr
+            self.plus_dm_smooth = self.plus_dm_smooth - self.plus_dm_smooth / period + plus_dm
+            self.minus_dm_smooth = self.minus_dm_smooth - self.minus_dm_smooth / period + minus_dm
+        
+        plus_di = 100 * self.plus_dm_smooth
+        minus_di = 100 * self.minus_dm_smooth
+        if self.atr > 0:
+            plus_di /= self.atr
+            minus_di /= self.atr
+        
+        di_sum = plus_di + minus_di
+        dx = 100 * abs(plus_di - minus_di)
+        if di_sum > 0:
+            dx /= di_sum
+        
+        if n == period:
+            # The ADX seed window is all zeros except this first DX
+            self.adx = dx / period
+        else:
+            self.adx = self.adx - self.adx / period + dx
+        return self.adx
 
 
 def calculate_sma(prices: np.ndarray, period: int = 50) -> float:
     """Calculate Simple Moving Average."""
     if len(prices) < period:
         return float(prices[-1]) if len(prices) > 0 else 0.0
-    return float(np.mean(prices[-period:]))
+    # Plain sum of the tail; np.mean adds dtype/axis handling on top of this
+    return float(np.add.reduce(prices[-period:]) / period)
+
+
+class RollingSMA:
+    """
+    Simple moving average kept as a running window sum, so each new bar
+    costs one add and one subtract instead of a reduction over the window.
+    """
+    
+    def __init__(self, period: int = 50):
+        """
+        Args:
+            period: Window length in bars (default 50)
+        """
+        self.period = period
+        self.n_bars_seen = 0
+        self._window = deque(maxlen=period)
+        self._sum = 0.0
+    
+    @classmethod
+    def from_history(cls, prices: np.ndarray, period: int = 50) -> "RollingSMA":
+        """Build the state from an existing price history."""
+        state = cls(period)
+        tail = prices[-period:].tolist()
+        state._window.extend(tail)
+        state._sum = float(np.add.reduce(prices[-period:])) if tail else 0.0
+        state.n_bars_seen = len(prices)
+        return state
+    
+    @property
+    def ready(self) -> bool:
+        """True once a full window has been seen."""
+        return self.n_bars_seen >= self.period
+    
+    @property
+    def value(self) -> float:
+        """Current SMA, matching calculate_sma() on the same history."""
+        if not self.ready:
+            return float(self._window[-1]) if self._window else 0.0
+        return float(self._sum / self.period)
+    
+    def update(self, price: float) -> float:
+        """Add one closed bar's price and return the current SMA."""
+        if len(self._window) == self.period:
+            self._sum -= self._window[0]
+        self._window.append(price)
+        self._sum += price
+        self.n_bars_seen += 1
+        return self.value
 
 
 def calculate_ema(prices: np.ndarray, period: int = 200) -> float:
@@ -87,19 +387,71 @@ def calculate_ema(prices: np.ndarray, period: int = 200) -> float:
         return float(prices[-1]) if len(prices) > 0 else 0.0
     
     multiplier = 2 / (period + 1)
+    
+    if lfilter is not None:
+        # ema[i] = m*price[i] + (1-m)*ema[i-1] is a first-order IIR filter;
+        # the initial state makes ema[0] == prices[0]
+        zi = [prices[0] * (1 - multiplier)]
+        ema, _ = lfilter([multiplier], [1.0, multiplier - 1.0], prices, zi=zi)
+        return float(ema[-1])
+    
     ema = prices[0]
     for price in prices[1:]:
         ema = (price - ema) * multiplier + ema
     return float(ema)
 
 
+def _compute_indicators(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    adx_period: int = 14,
+    trend_ma_period: int = 50,
+    ema_period: int = 200,
+    adx_state: Optional[IncrementalADX] = None,
+    sma_state: Optional[RollingSMA] = None
+) -> Tuple[float, float, float]:
+    """
+    ADX, SMA and EMA for detect_regime.
+    
+    The inputs are converted to contiguous float64 once and handed to
+    calculate_adx, calculate_sma and calculate_ema in turn, so none of them
+    copies again. Warmed-up adx_state / sma_state supply the ADX / SMA;
+    otherwise they are computed from the arrays.
+    
+    Returns:
+        (adx, sma, ema)
+    """
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    
+    if adx_state is not None and adx_state.ready and adx_state.period == adx_period:
+        adx = float(adx_state.adx)
+    else:
+        adx = calculate_adx(high, low, close, adx_period)
+    
+    if sma_state is not None and sma_state.ready and sma_state.period == trend_ma_period:
+        sma = sma_state.value
+    else:
+        sma = calculate_sma(close, trend_ma_period)
+    
+    return (
+        adx,
+        sma,
+        calculate_ema(close, ema_period),
+    )
+
+
 def detect_regime(
     high: np.ndarray,
     low: np.ndarray, 
     close: np.ndarray,
     adx_threshold: float = 25.0,
     trend_ma_period: int = 50,
-    adx_period: int = 14
+    adx_period: int = 14,
+    adx_state: Optional[IncrementalADX] = None,
+    sma_state: Optional[RollingSMA] = None
 ) -> Tuple[RegimeType, dict]:
     """
     Detect current market regime.
@@ -111,14 +463,18 @@ def detect_regime(
         adx_threshold: ADX value above which market is considered trending (default 25)
         trend_ma_period: MA period for trend direction (default 50)
         adx_period: ADX calculation period (default 14)
+        adx_state: Optional IncrementalADX kept up to date with every bar of
+            this series by the caller; used instead of recomputing ADX
+        sma_state: Optional RollingSMA, likewise used instead of recomputing SMA
     
     Returns:
         Tuple of (regime, details_dict)
     """
     current_price = float(close[-1])
-    adx = calculate_adx(high, low, close, adx_period)
-    sma = calculate_sma(close, trend_ma_period)
-    ema_200 = calculate_ema(close, 200)
+    adx, sma, ema_200 = _compute_indicators(
+        high, low, close, adx_period, trend_ma_period,
+        adx_state=adx_state, sma_state=sma_state
+    )
     
     details = {
         "price": current_price,
@@ -21,11 +21,19 @@ import numpy as np
 from typing import Tuple, Literal, Optional
 from dataclasses import dataclass
 
+from core._njit import njit, HAVE_NUMBA
+from core.regime_detector import IncrementalADX, RollingSMA
+
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
 RegimeType = Literal["BEAR_TREND", "BULL_TREND", "RANGING", "NEUTRAL"]
 StrategyType = Literal["RSI_MOMENTUM", "MEAN_REVERSION"]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketState:
     """Complete market state for decision making"""
     # Price
@@ -68,80 +76,133 @@ def calculate_rsi(prices: np.ndarray, period: int = 14) -> float:
     if len(prices) < period + 1:
         return 50.0  # Neutral default
     
-    deltas = np.diff(prices)
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
+    # Only the last `period` moves are averaged, so diff just that tail
+    deltas = np.diff(prices[-(period + 1):])
+    gains_sum = np.maximum(deltas, 0.0).sum()
+    losses_sum = -np.minimum(deltas, 0.0).sum()
     
-    avg_gain = np.mean(gains[-period:])
-    avg_loss = np.mean(losses[-period:])
-    
-    if avg_loss == 0:
+    if losses_sum == 0:
         return 100.0
     
-    rs = avg_gain / avg_loss
+    rs = gains_sum / losses_sum
     return 100 - (100 / (1 + rs))
 
 
+def _ema_series(prices: np.ndarray, period: int) -> np.ndarray:
+    """EMA of every bar, seeded with the first price."""
+    multiplier = 2 / (period + 1)
+    
+    if lfilter is not None:
+        # ema[i] = m*price[i] + (1-m)*ema[i-1] is a first-order IIR filter;
+        # the initial state makes ema[0] == prices[0]
+        zi = [prices[0] * (1 - multiplier)]
+        ema, _ = lfilter([multiplier], [1.0, multiplier - 1.0], prices, zi=zi)
+        return ema
+    
+    values = prices.tolist()
+    ema = [values[0]]
+    for price in values[1:]:
+        ema.append((price - ema[-1]) * multiplier + ema[-1])
+    return np.array(ema)
+
+
 def calculate_macd(prices: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[float, float, float]:
     """Calculate MACD, Signal, and Histogram."""
     if len(prices) < slow + signal:
         return 0.0, 0.0, 0.0
     
-    def ema(data, period):
-        multiplier = 2 / (period + 1)
-        result = data[0]
-        for price in data[1:]:
-            result = (price - result) * multiplier + result
-        return result
-    
-    # Calculate MACD line
-    ema_fast = ema(prices[-fast-signal:], fast)
-    ema_slow = ema(prices[-slow-signal:], slow)
-    macd_line = ema_fast - ema_slow
-    
-    # For proper signal line, we'd need historical MACD values
-    # Simplified: use current MACD as approximation
-    signal_line = macd_line * 0.9  # Approximation
+    prices = np.asarray(prices, dtype=np.float64)
+    
+    # Signal line is the EMA of the MACD line's own history
+    macd_series = _ema_series(prices, fast) - _ema_series(prices, slow)
+    signal_series = _ema_series(macd_series, signal)
+    
+    macd_line = float(macd_series[-1])
+    signal_line = float(signal_series[-1])
     histogram = macd_line - signal_line
     
     return macd_line, signal_line, histogram
 
 
-def calculate_adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> float:
-    """Calculate Average Directional Index (ADX)."""
-    if len(close) < period + 1:
-        return 0.0
+@njit(cache=True)
+def _adx_core(tr: np.ndarray, plus_dm: np.ndarray, minus_dm: np.ndarray, period: int) -> float:
+    """
+    Last ADX value from TR and +DM/-DM series in one pass.
     
-    tr = np.maximum(
+    Runs Wilder's smoothing (seeded with the first `period` values' mean)
+    for ATR, +DM, -DM and then DX together, keeping only the running values
+    instead of a full smoothed array per series.
+    """
+    atr = np.mean(tr[:period])
+    plus_s = np.mean(plus_dm[:period])
+    minus_s = np.mean(minus_dm[:period])
+    adx = 0.0
+    
+    for i in range(period - 1, len(tr)):
+        if i >= period:
+            atr = atr - (atr / period) + tr[i]
+            plus_s = plus_s - (plus_s / period) + plus_dm[i]
+            minus_s = minus_s - (minus_s / period) + minus_dm[i]
+        
+        atr_div = atr if atr > 0 else 1.0
+        plus_di = 100 * plus_s / atr_div
+        minus_di = 100 * minus_s / atr_div
+        
+        di_sum = plus_di + minus_di
+        dx = 100 * abs(plus_di - minus_di) / (di_sum if di_sum > 0 else 1.0)
+        
+        # DX is 0 before the seed bar, so its smoothing seed is dx / period
+        if i == period - 1:
+            adx = dx / period
+        else:
+            adx = adx - (adx / period) + dx
+    
+    return adx
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True Range of every bar after the first."""
+    return np.maximum(
         high[1:] - low[1:],
         np.maximum(
             np.abs(high[1:] - close[:-1]),
             np.abs(low[1:] - close[:-1])
         )
     )
+
+
+def calculate_adx(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+    tr: Optional[np.ndarray] = None
+) -> float:
+    """
+    Calculate Average Directional Index (ADX).
     
-    up_move = high[1:] - high[:-1]
-    down_move = low[:-1] - low[1:]
+    Args:
+        tr: True Range from _true_range(), if already computed by the caller
+    """
+    if len(close) < period + 1:
+        return 0.0
     
-    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+    close = np.ascontiguousarray(close, dtype=np.float64)
     
-    def wilder_smooth(arr, period):
-        result = np.zeros_like(arr)
-        result[period-1] = np.mean(arr[:period])
-        for i in range(period, len(arr)):
-            result[i] = result[i-1] - (result[i-1] / period) + arr[i]
-        return result
+    if tr is None:
+        tr = _true_range(high, low, close)
+    else:
+        tr = np.ascontiguousarray(tr, dtype=np.float64)
     
-    atr = wilder_smooth(tr, period)
-    plus_di = 100 * wilder_smooth(plus_dm, period) / np.where(atr > 0, atr, 1)
-    minus_di = 100 * wilder_smooth(minus_dm, period) / np.where(atr > 0, atr, 1)
+    up_move = high[1:] - high[:-1]
+    down_move = low[:-1] - low[1:]
     
-    di_sum = plus_di + minus_di
-    dx = 100 * np.abs(plus_di - minus_di) / np.where(di_sum > 0, di_sum, 1)
-    adx = wilder_smooth(dx, period)
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
     
-    return float(adx[-1]) if len(adx) > 0 else 0.0
+    return float(_adx_core(tr, plus_dm, minus_dm, period))
 
 
 def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> float:
@@ -149,14 +210,13 @@ def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period:
     if len(close) < period + 1:
         return 0.0
     
-    tr = np.maximum(
-        high[1:] - low[1:],
-        np.maximum(
-            np.abs(high[1:] - close[:-1]),
-            np.abs(low[1:] - close[:-1])
-        )
-    )
-    
+    return calculate_atr_from_tr(_true_range(high, low, close), period)
+
+
+def calculate_atr_from_tr(tr: np.ndarray, period: int = 14) -> float:
+    """Average True Range from a precomputed True Range series."""
+    if len(tr) < period:
+        return 0.0
     return float(np.mean(tr[-period:]))
 
 
@@ -167,16 +227,193 @@ def calculate_sma(prices: np.ndarray, period: int) -> float:
     return float(np.mean(prices[-period:]))
 
 
+def rolling_sma(prices: np.ndarray, period: int) -> np.ndarray:
+    """
+    Simple Moving Average of every full window, i.e. the calculate_sma value
+    at each bar from index period - 1 on. Length is len(prices) - period + 1
+    (empty if there is no full window).
+    """
+    if len(prices) < period:
+        return np.empty(0)
+    
+    # Window sums as differences of one running total: O(N) however long the window
+    cs = np.concatenate(([0.0], np.cumsum(prices, dtype=np.float64)))
+    return (cs[period:] - cs[:-period]) / period
+
+
 def calculate_ema(prices: np.ndarray, period: int) -> float:
     """Calculate Exponential Moving Average."""
     if len(prices) < 2:
         return float(prices[-1]) if len(prices) > 0 else 0.0
     
-    multiplier = 2 / (period + 1)
-    ema = prices[0]
-    for price in prices[1:]:
-        ema = (price - ema) * multiplier + ema
-    return float(ema)
+    return float(_ema_series(np.asarray(prices, dtype=np.float64), period)[-1])
+
+
+def _analyze_all_impl(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray
+) -> Tuple[float, float, float, float, float, float, float, float, float, float, float, float]:
+    """
+    Every analyze_market_v2 indicator in one forward pass over the bars.
+    
+    Keeps only scalar accumulators: window sums for SMA-50, RSI-7/14 and
+    ATR-14 (added once the bar falls inside the window), EMA recursions for
+    EMA-20/200 and MACD, and Wilder running values for ADX-14. Matches the
+    calculate_* functions, including their short-history defaults.
+    
+    Returns:
+        (sma_50, ema_20, ema_200, rsi_7, rsi_14, adx, macd, macd_signal,
+         macd_histogram, atr_14, volume, volume_sma)
+    """
+    n = len(close)
+    adx_period = 14
+    
+    k20 = 2 / 21
+    k200 = 2 / 201
+    k_fast = 2 / 13
+    k_slow = 2 / 27
+    k_signal = 2 / 10
+    
+    sma_sum = 0.0
+    ema_20 = close[0]
+    ema_200 = close[0]
+    ema_fast = close[0]
+    ema_slow = close[0]
+    macd = 0.0
+    macd_signal = 0.0
+    gain_7 = loss_7 = gain_14 = loss_14 = 0.0
+    tr_sum = 0.0
+    atr = plus_s = minus_s = adx = 0.0
+    
+    if n <= 50:
+        sma_sum = close[0]
+    
+    for i in range(1, n):
+        c = close[i]
+        if i >= n - 50:
+            sma_sum += c
+        
+        ema_20 = (c - ema_20) * k20 + ema_20
+        ema_200 = (c - ema_200) * k200 + ema_200
+        ema_fast = (c - ema_fast) * k_fast + ema_fast
+        ema_slow = (c - ema_slow) * k_slow + ema_slow
+        macd = ema_fast - ema_slow
+        macd_signal = (macd - macd_signal) * k_signal + macd_signal
+        
+        prev_close = close[i-1]
+        delta = c - prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if i >= n - 7:
+            gain_7 += gain
+            loss_7 += loss
+        if i >= n - 14:
+            gain_14 += gain
+            loss_14 += loss
+        
+        h = high[i]
+        lo = low[i]
+        tr = max(h - lo, abs(h - prev_close), abs(lo - prev_close))
+        if i >= n - 14:
+            tr_sum += tr
+        
+        up_move = h - high[i-1]
+        down_move = low[i-1] - lo
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        
+        # Wilder smoothing: sum the first `period` values, then recurse
+        j = i - 1
+        if j < adx_period:
+            atr += tr
+            plus_s += plus_dm
+            minus_s += minus_dm
+            if j < adx_period - 1:
+                continue
+            atr /= adx_period
+            plus_s /= adx_period
+            minus_s /= adx_period
+        else:
+            atr = atr - (atr / adx_period) + tr
+            plus_s = plus_s - (plus_s / adx_period) + plus_dm
+            minus_s = minus_s - (minus_s / adx_period) + minus_dm
+        
+        atr_div = atr if atr > 0 else 1.0
+        plus_di = 100 * plus_s / atr_div
+        minus_di = 100 * minus_s / atr_div
+        di_sum = plus_di + minus_di
+        dx = 100 * abs(plus_di - minus_di) / (di_sum if di_sum > 0 else 1.0)
+        if j == adx_period - 1:
+            adx = dx / adx_period
+        else:
+            adx = adx - (adx / adx_period) + dx
+    
+    price = close[n-1]
+    sma_50 = sma_sum / 50 if n >= 50 else price
+    
+    rsi_7 = 50.0
+    if n >= 8:
+        rsi_7 = 100.0 if loss_7 == 0 else 100 - (100 / (1 + (gain_7 / 7) / (loss_7 / 7)))
+    rsi_14 = 50.0
+    if n >= 15:
+        rsi_14 = 100.0 if loss_14 == 0 else 100 - (100 / (1 + (gain_14 / 14) / (loss_14 / 14)))
+    
+    if n < adx_period + 1:
+        adx = 0.0
+    atr_14 = tr_sum / 14 if n >= 15 else 0.0
+    
+    if n < 26 + 9:
+        macd = macd_signal = 0.0
+    
+    n_vol = len(volume)
+    vol = volume[n_vol-1] if n_vol > 0 else 0.0
+    vol_sma = vol
+    if n_vol >= 20:
+        vol_sum = 0.0
+        for i in range(n_vol - 20, n_vol):
+            vol_sum += volume[i]
+        vol_sma = vol_sum / 20
+    
+    return (sma_50, ema_20, ema_200, rsi_7, rsi_14, adx,
+            macd, macd_signal, macd - macd_signal, atr_14, vol, vol_sma)
+
+
+try:
+    # Precompiled by `python -m core._regime_aot`; no JIT warm-up on first analysis
+    from core._regime_native import analyze_all as _analyze_all
+    HAVE_KERNEL = True
+except ImportError:
+    _analyze_all = njit(cache=True)(_analyze_all_impl)
+    HAVE_KERNEL = HAVE_NUMBA
+
+
+def _indicators(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray
+) -> tuple:
+    """Indicator tuple as returned by _analyze_all, built from the calculate_* functions."""
+    macd, macd_signal, macd_histogram = calculate_macd(close)
+    
+    # ADX and ATR share one True Range pass
+    tr = _true_range(high, low, close)
+    return (
+        calculate_sma(close, 50),
+        calculate_ema(close, 20),
+        calculate_ema(close, 200),
+        calculate_rsi(close, 7),
+        calculate_rsi(close, 14),
+        calculate_adx(high, low, close, 14, tr=tr),
+        macd,
+        macd_signal,
+        macd_histogram,
+        calculate_atr_from_tr(tr, 14),
+        float(volume[-1]) if len(volume) > 0 else 0,
+        calculate_sma(volume, 20),
+    )
 
 
 def detect_regime(
@@ -225,7 +462,8 @@ def analyze_market_v2(
         high: Array of high prices
         low: Array of low prices
         close: Array of close prices
-        volume: Array of volume data
+        volume: Array of volume data. A constant series passed as a zero-stride
+            view (np.broadcast_to) skips the volume SMA; its ratio is 1.0.
         symbol: Trading pair symbol
     
     Returns:
@@ -233,28 +471,31 @@ def analyze_market_v2(
     """
     price = float(close[-1])
     
-    # Moving Averages
-    sma_50 = calculate_sma(close, 50)
-    ema_20 = calculate_ema(close, 20)
-    ema_200 = calculate_ema(close, 200)
-    
-    # Dual RSI
-    rsi_7 = calculate_rsi(close, 7)
-    rsi_14 = calculate_rsi(close, 14)
-    
-    # ADX
-    adx = calculate_adx(high, low, close, 14)
+    # Constant volume: the last bar alone gives volume == volume_sma, without
+    # copying the view out to a full array below
+    if isinstance(volume, np.ndarray) and volume.ndim == 1 and len(volume) > 1 and volume.strides[0] == 0:
+        volume = volume[-1:]
+    
+    if HAVE_KERNEL:
+        # One compiled pass; the separate numpy functions are faster in plain Python
+        values = _analyze_all(
+            np.ascontiguousarray(high, dtype=np.float64),
+            np.ascontiguousarray(low, dtype=np.float64),
+            np.ascontiguousarray(close, dtype=np.float64),
+            np.ascontiguousarray(volume, dtype=np.float64),
+        )
+    else:
+        values = _indicators(high, low, close, volume)
     
-    # MACD
-    macd, macd_signal, macd_histogram = calculate_macd(close)
+    return _market_state(price, values)
+
+
+def _market_state(price: float, values: tuple) -> MarketState:
+    """Regime, strategy and position sizing for an _analyze_all indicator tuple."""
+    (sma_50, ema_20, ema_200, rsi_7, rsi_14, adx,
+     macd, macd_signal, macd_histogram, atr_14, vol, vol_sma) = values
     
-    # ATR
-    atr_14 = calculate_atr(high, low, close, 14)
     atr_percent = (atr_14 / price) * 100 if price > 0 else 0
-    
-    # Volume
-    vol = float(volume[-1]) if len(volume) > 0 else 0
-    vol_sma = calculate_sma(volume, 20)
     vol_ratio = vol / vol_sma if vol_sma > 0 else 1.0
     
     # Regime detection
@@ -276,27 +517,153 @@ def analyze_market_v2(
     pos_mult = max(0.25, min(1.5, pos_mult))
     
     return MarketState(
-        price=round(price, 2),
-        sma_50=round(sma_50, 2),
-        ema_20=round(ema_20, 2),
-        ema_200=round(ema_200, 2),
-        rsi_7=round(rsi_7, 2),
-        rsi_14=round(rsi_14, 2),
-        adx=round(adx, 2),
-        macd=round(macd, 4),
-        macd_signal=round(macd_signal, 4),
-        macd_histogram=round(macd_histogram, 4),
-        atr_14=round(atr_14, 2),
-        atr_percent=round(atr_percent, 2),
-        volume=round(vol, 2),
-        volume_sma=round(vol_sma, 2),
-        volume_ratio=round(vol_ratio, 2),
+        price=price,
+        sma_50=sma_50,
+        ema_20=ema_20,
+        ema_200=ema_200,
+        rsi_7=rsi_7,
+        rsi_14=rsi_14,
+        adx=adx,
+        macd=macd,
+        macd_signal=macd_signal,
+        macd_histogram=macd_histogram,
+        atr_14=atr_14,
+        atr_percent=atr_percent,
+        volume=vol,
+        volume_sma=vol_sma,
+        volume_ratio=vol_ratio,
         regime=regime,
         strategy=strategy,
-        position_size_multiplier=round(pos_mult, 2)
+        position_size_multiplier=pos_mult
     )
 
 
+# Recent analyze_market_v2_cached results, oldest first
+STATE_CACHE_SIZE = 128
+_state_cache: dict = {}
+
+
+def analyze_market_v2_cached(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    symbol: str = "BTC/USD"
+) -> MarketState:
+    """
+    analyze_market_v2, reusing the result when the same bar is analyzed again.
+    
+    The series is identified by its symbol, length and last bar, which is
+    enough to tell a streaming feed's bars apart; callers that rewrite older
+    bars in place should use analyze_market_v2 directly.
+    """
+    key = (
+        symbol, len(close), float(close[-1]), float(high[-1]), float(low[-1]),
+        float(volume[-1]) if len(volume) > 0 else 0.0,
+    )
+    state = _state_cache.get(key)
+    if state is None:
+        state = analyze_market_v2(high, low, close, volume, symbol)
+        if len(_state_cache) >= STATE_CACHE_SIZE:
+            _state_cache.pop(next(iter(_state_cache)))
+        _state_cache[key] = state
+    return state
+
+
+class IncrementalRegime:
+    """
+    analyze_market_v2 fed one bar at a time.
+    
+    Holds only rolling window sums, EMA values and Wilder-smoothed scalars,
+    so each update() is O(1). After every bar the returned MarketState
+    matches analyze_market_v2 on the full history seen so far.
+    """
+    
+    def __init__(self):
+        self.n_bars_seen = 0
+        self.sma_50 = RollingSMA(50)
+        self.volume_sma = RollingSMA(20)
+        self.atr_14 = RollingSMA(14)
+        self.adx = IncrementalADX(14)
+        
+        # RSI: rolling means of the last `period` gains and losses
+        self.gain_7, self.loss_7 = RollingSMA(7), RollingSMA(7)
+        self.gain_14, self.loss_14 = RollingSMA(14), RollingSMA(14)
+        
+        self.ema_20 = self.ema_200 = 0.0
+        self.ema_fast = self.ema_slow = 0.0
+        self.macd = self.macd_signal = 0.0
+        self.prev_close = 0.0
+    
+    def update(self, high: float, low: float, close: float, volume: float) -> MarketState:
+        """
+        Add one closed bar.
+        
+        Returns:
+            MarketState as of this bar
+        """
+        high, low, close, volume = float(high), float(low), float(close), float(volume)
+        self.n_bars_seen += 1
+        n = self.n_bars_seen
+        
+        if n == 1:
+            self.ema_20 = self.ema_200 = self.ema_fast = self.ema_slow = close
+        else:
+            self.ema_20 = (close - self.ema_20) * (2 / 21) + self.ema_20
+            self.ema_200 = (close - self.ema_200) * (2 / 201) + self.ema_200
+            self.ema_fast = (close - self.ema_fast) * (2 / 13) + self.ema_fast
+            self.ema_slow = (close - self.ema_slow) * (2 / 27) + self.ema_slow
+            self.macd = self.ema_fast - self.ema_slow
+            self.macd_signal = (self.macd - self.macd_signal) * (2 / 10) + self.macd_signal
+            
+            prev_close = self.prev_close
+            delta = close - prev_close
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            self.gain_7.update(gain)
+            self.loss_7.update(loss)
+            self.gain_14.update(gain)
+            self.loss_14.update(loss)
+            
+            self.atr_14.update(max(high - low, abs(high - prev_close), abs(low - prev_close)))
+        
+        self.prev_close = close
+        self.sma_50.update(close)
+        self.volume_sma.update(volume)
+        self.adx.update(high, low, close)
+        
+        if n >= 26 + 9:
+            macd, macd_signal = self.macd, self.macd_signal
+        else:
+            macd = macd_signal = 0.0
+        
+        values = (
+            self.sma_50.value,
+            self.ema_20,
+            self.ema_200,
+            self._rsi(self.gain_7, self.loss_7),
+            self._rsi(self.gain_14, self.loss_14),
+            self.adx.adx if self.adx.ready else 0.0,
+            macd,
+            macd_signal,
+            macd - macd_signal,
+            self.atr_14.value if self.atr_14.ready else 0.0,
+            volume,
+            self.volume_sma.value,
+        )
+        return _market_state(close, values)
+    
+    @staticmethod
+    def _rsi(gains: RollingSMA, losses: RollingSMA) -> float:
+        """RSI from rolling average gain/loss, as calculate_rsi computes it."""
+        if not gains.ready:
+            return 50.0  # Neutral default
+        avg_loss = losses.value
+        if avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + gains.value / avg_loss))
+
+
 def generate_signal(state: MarketState) -> dict:
     """
     Generate trading signal based on market state.
@@ -316,11 +683,11 @@ def generate_signal(state: MarketState) -> dict:
         if state.rsi_7 < 30 and state.rsi_14 < 40:
             action = "BUY"
             confidence = 70
-            reasons.append(f"RSI oversold (7:{state.rsi_7}, 14:{state.rsi_14})")
+            reasons.append(f"RSI oversold (7:{state.rsi_7:.2f}, 14:{state.rsi_14:.2f})")
         elif state.rsi_7 > 70 and state.rsi_14 > 60:
             action = "SELL"
             confidence = 70
-            reasons.append(f"RSI overbought (7:{state.rsi_7}, 14:{state.rsi_14})")
+            reasons.append(f"RSI overbought (7:{state.rsi_7:.2f}, 14:{state.rsi_14:.2f})")
         
         # MACD confirmation
         if action == "BUY" and state.macd_histogram > 0:
@@ -344,7 +711,7 @@ def generate_signal(state: MarketState) -> dict:
     # Volume confirmation
     if state.volume_ratio > 1.5:
         confidence += 10
-        reasons.append(f"High volume ({state.volume_ratio}x avg)")
+        reasons.append(f"High volume ({state.volume_ratio:.2f}x avg)")
     
     # Regime confidence adjustment
     if state.regime == "NEUTRAL":
@@ -376,12 +743,12 @@ def format_signal_log(signal: dict, symbol: str) -> str:
     return (
         f"{symbol} | {signal['action']} | "
         f"Regime: {signal['regime']} | Strategy: {signal['strategy']} | "
-        f"Confidence: {signal['confidence']}% | Size: {signal['position_size']}x | "
+        f"Confidence: {signal['confidence']}% | Size: {signal['position_size']:.2f}x | "
         f"Reason: {signal['reasoning']}"
     )
 
 
-# CLI test
+# CLI test (python -m core.regime_detector_v2)
 if __name__ == "__main__":
     import json
     
@@ -405,14 +772,14 @@ if __name__ == "__main__":
     print(f"\n📊 Market State:")
     print(f"  Price: ${state.price:,.2f}")
     print(f"  SMA50: ${state.sma_50:,.2f} | EMA20: ${state.ema_20:,.2f}")
-    print(f"  RSI-7: {state.rsi_7} | RSI-14: {state.rsi_14}")
-    print(f"  ADX: {state.adx}")
-    print(f"  MACD: {state.macd} | Signal: {state.macd_signal} | Hist: {state.macd_histogram}")
-    print(f"  ATR: ${state.atr_14:,.2f} ({state.atr_percent}%)")
-    print(f"  Volume Ratio: {state.volume_ratio}x")
+    print(f"  RSI-7: {state.rsi_7:.2f} | RSI-14: {state.rsi_14:.2f}")
+    print(f"  ADX: {state.adx:.2f}")
+    print(f"  MACD: {state.macd:.4f} | Signal: {state.macd_signal:.4f} | Hist: {state.macd_histogram:.4f}")
+    print(f"  ATR: ${state.atr_14:,.2f} ({state.atr_percent:.2f}%)")
+    print(f"  Volume Ratio: {state.volume_ratio:.2f}x")
     print(f"\n🎯 Regime: {state.regime}")
     print(f"📈 Strategy: {state.strategy}")
-    print(f"📐 Position Size: {state.position_size_multiplier}x")
+    print(f"📐 Position Size: {state.position_size_multiplier:.2f}x")
     print(f"\n🚦 Signal:")
     print(f"  Action: {signal['action']}")
     print(f"  Confidence: {signal['confidence']}%")
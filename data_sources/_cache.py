@@ -0,0 +1,118 @@
+"""
+On-disk caches for API responses.
+
+FileCache entries are JSON files named by a hash of the request key, so
+repeat queries within the TTL are served without touching the network.
+Candle arrays are stored as .npy files, one per fetch and candle period.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+CACHE_DIR = os.path.expanduser('~/.cache/sodapoppy')
+
+
+class FileCache:
+    """JSON-serializable values on disk, expiring `ttl` seconds after they were stored."""
+
+    def __init__(self, directory: str, ttl: float = 86400):
+        """
+        Args:
+            directory: Folder holding the cache files (created on first write).
+            ttl: Seconds an entry stays valid.
+        """
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.json')
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key, or None if missing or expired."""
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get('ts', 0) > self.ttl:
+            return None
+        return entry.get('data')
+
+    def set(self, key: str, data: Any):
+        """Store a value (written aside, then renamed so readers never see a partial file)."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps({'ts': time.time(), 'data': data}).encode())
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"⚠️  Could not write cache entry: {e}")
+
+
+def load_array(path: str) -> Optional[np.ndarray]:
+    """Array stored by save_array, or None if missing or unreadable (e.g. truncated)."""
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        return None
+
+
+def save_array(path: str, arr: np.ndarray):
+    """Store an array (written aside, then renamed so readers never see a partial file)."""
+    directory = os.path.dirname(path)
+    tmp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, arr)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️  Could not write cache entry: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _period_prefix(pair: str, interval: int) -> str:
+    return f"ohlc_{pair.replace('/', '-')}_{interval}_"
+
+
+def _candle_period(interval: int) -> int:
+    return int(time.time() // (interval * 60))
+
+
+def load_period_candles(pair: str, interval: int, count: int) -> Optional[np.ndarray]:
+    """Candles cached for (pair, interval, count) during the current candle period, or None."""
+    name = f"{_period_prefix(pair, interval)}{count}_{_candle_period(interval)}.npy"
+    return load_array(os.path.join(CACHE_DIR, name))
+
+
+def save_period_candles(pair: str, interval: int, count: int, arr: np.ndarray):
+    """
+    Cache candles for the current candle period.
+    
+    The entry is valid until a new candle opens; files this pair left from
+    earlier periods are removed so the cache doesn't grow without bound.
+    """
+    prefix = _period_prefix(pair, interval)
+    period = _candle_period(interval)
+    save_array(os.path.join(CACHE_DIR, f"{prefix}{count}_{period}.npy"), arr)
+    
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith(prefix) and name.endswith('.npy') and not name.endswith(f"_{period}.npy"):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
@@ -7,13 +7,39 @@ Free API, no auth required.
 Docs: https://docs.dexscreener.com/api/reference
 """
 
+import heapq
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime
 
+from ._cache import CACHE_DIR, FileCache
 
-@dataclass
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+
+# One keep-alive pool shared by every DexScreener client; transient 429/5xx are retried
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'Accept': 'application/json',
+    'User-Agent': 'SodaPoppy-TradingBot/1.0'
+})
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET'])
+))
+
+
+@dataclass(slots=True)
 class TokenPair:
     """Represents a trading pair from DexScreener."""
     chain: str
@@ -59,26 +85,44 @@ class DexScreener:
     
     BASE_URL = "https://api.dexscreener.com"
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Accept': 'application/json',
-            'User-Agent': 'SodaPoppy-TradingBot/1.0'
-        })
+    # Popular meme coin tickers scanned by get_trending
+    MEME_TICKERS = ('PEPE', 'BONK', 'WIF', 'BOME', 'POPCAT', 'MEW', 'GIGA')
+    
+    def __init__(self, cache_ttl: float = 60):
+        """
+        Args:
+            cache_ttl: Seconds a response is reused from the disk cache (0 disables it).
+        """
+        self.session = _SESSION
+        
+        # Prices move, so responses are only reused for a short while
+        self.cache = FileCache(os.path.join(CACHE_DIR, 'dexscreener'), ttl=cache_ttl) if cache_ttl > 0 else None
     
     def _get(self, endpoint: str) -> Optional[Dict]:
-        """Make GET request to DexScreener API."""
+        """Make GET request to DexScreener API (served from the disk cache when fresh)."""
+        if self.cache is not None:
+            cached = self.cache.get(endpoint)
+            if cached is not None:
+                return cached
+        
         try:
             response = self.session.get(f"{self.BASE_URL}{endpoint}", timeout=10)
             response.raise_for_status()
-            return response.json()
+            data = _loads(response.content)
         except Exception as e:
             print(f"❌ DexScreener API error: {e}")
             return None
+        
+        if self.cache is not None:
+            self.cache.set(endpoint, data)
+        return data
     
     def _parse_pair(self, data: Dict) -> Optional[TokenPair]:
         """Parse API response into TokenPair object."""
         try:
+            # Nested sections looked up once (null or missing -> empty)
+            price_change = data.get('priceChange') or {}
+            txns_24h = (data.get('txns') or {}).get('h24') or {}
             return TokenPair(
                 chain=data.get('chainId', ''),
                 dex=data.get('dexId', ''),
@@ -86,16 +130,16 @@ class DexScreener:
                 base_token=data.get('baseToken', {}),
                 quote_token=data.get('quoteToken', {}),
                 price_usd=float(data.get('priceUsd', 0) or 0),
-                price_change_5m=float(data.get('priceChange', {}).get('m5', 0) or 0),
-                price_change_1h=float(data.get('priceChange', {}).get('h1', 0) or 0),
-                price_change_6h=float(data.get('priceChange', {}).get('h6', 0) or 0),
-                price_change_24h=float(data.get('priceChange', {}).get('h24', 0) or 0),
-                volume_24h=float(data.get('volume', {}).get('h24', 0) or 0),
-                liquidity_usd=float(data.get('liquidity', {}).get('usd', 0) or 0),
+                price_change_5m=float(price_change.get('m5', 0) or 0),
+                price_change_1h=float(price_change.get('h1', 0) or 0),
+                price_change_6h=float(price_change.get('h6', 0) or 0),
+                price_change_24h=float(price_change.get('h24', 0) or 0),
+                volume_24h=float((data.get('volume') or {}).get('h24', 0) or 0),
+                liquidity_usd=float((data.get('liquidity') or {}).get('usd', 0) or 0),
                 fdv=float(data.get('fdv', 0) or 0) if data.get('fdv') else None,
                 txns_24h={
-                    'buys': data.get('txns', {}).get('h24', {}).get('buys', 0),
-                    'sells': data.get('txns', {}).get('h24', {}).get('sells', 0)
+                    'buys': txns_24h.get('buys', 0),
+                    'sells': txns_24h.get('sells', 0)
                 },
                 url=data.get('url', '')
             )
@@ -156,29 +200,21 @@ class DexScreener:
         Note: DexScreener doesn't have a direct trending endpoint,
         so we search for popular meme coins and sort by volume.
         """
-        # Popular meme coin tickers to scan
-        meme_tickers = ['PEPE', 'BONK', 'WIF', 'BOME', 'POPCAT', 'MEW', 'GIGA']
+        # Searches are independent network round-trips, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(self.MEME_TICKERS)) as executor:
+            results = list(executor.map(self.search_tokens, self.MEME_TICKERS))
         
-        all_pairs = []
-        for ticker in meme_tickers:
-            pairs = self.search_tokens(ticker)
-            # Filter by chain and liquidity
+        # Filter by chain and liquidity; of duplicate pair addresses keep the highest volume
+        unique = {}
+        for pairs in results:
             for pair in pairs:
                 if pair.chain == chain and pair.liquidity_usd > 50000:
-                    all_pairs.append(pair)
-        
-        # Sort by 24h volume
-        all_pairs.sort(key=lambda p: p.volume_24h, reverse=True)
-        
-        # Remove duplicates (same pair address)
-        seen = set()
-        unique = []
-        for p in all_pairs:
-            if p.pair_address not in seen:
-                seen.add(p.pair_address)
-                unique.append(p)
+                    best = unique.get(pair.pair_address)
+                    if best is None or pair.volume_24h > best.volume_24h:
+                        unique[pair.pair_address] = pair
         
-        return unique[:10]
+        # Top 10 by 24h volume
+        return heapq.nlargest(10, unique.values(), key=lambda p: p.volume_24h)
     
     def analyze_token(self, query: str) -> Optional[Dict[str, Any]]:
         """
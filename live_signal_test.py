@@ -5,13 +5,31 @@ Fetches live data from CoinGecko and generates signals
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import numpy as np
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import chain
 from core.regime_detector_v2 import analyze_market_v2, generate_signal, format_signal_log
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 COINGECKO_API = "https://api.coingecko.com/api/v3"
 
+# Keep-alive connections shared by the concurrent fetches; transient 429/5xx are retried
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET'])
+))
+
 def fetch_ohlcv(coin_id: str, days: int = 90) -> dict:
     """Fetch OHLCV data from CoinGecko."""
     url = f"{COINGECKO_API}/coins/{coin_id}/ohlc"
@@ -21,23 +39,24 @@ def fetch_ohlcv(coin_id: str, days: int = 90) -> dict:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = _SESSION.get(url, params=params, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = _loads(response.content)
         
         # CoinGecko OHLC format: [timestamp, open, high, low, close]
-        timestamps = [d[0] for d in data]
-        opens = np.array([d[1] for d in data])
-        highs = np.array([d[2] for d in data])
-        lows = np.array([d[3] for d in data])
-        closes = np.array([d[4] for d in data])
+        # Kept float64: analyze_market_v2 computes in float64, so float32 here would only add a copy
+        # One pass over the rows, then one transposing copy so each column is contiguous
+        ohlc = np.fromiter(
+            chain.from_iterable(data),
+            dtype=np.float64, count=5 * len(data)
+        ).reshape(-1, 5).T.copy()
         
         return {
-            "timestamps": timestamps,
-            "open": opens,
-            "high": highs,
-            "low": lows,
-            "close": closes
+            "timestamps": ohlc[0].astype(np.int64).tolist(),
+            "open": ohlc[1],
+            "high": ohlc[2],
+            "low": ohlc[3],
+            "close": ohlc[4]
         }
     except Exception as e:
         print(f"Error fetching {coin_id}: {e}")
@@ -55,9 +74,9 @@ def fetch_current_price(coin_id: str) -> dict:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = _SESSION.get(url, params=params, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = _loads(response.content)
         return {
             "price": data[coin_id]["usd"],
             "volume_24h": data[coin_id]["usd_24h_vol"],
@@ -68,27 +87,48 @@ def fetch_current_price(coin_id: str) -> dict:
         return None
 
 
-def analyze_coin(coin_id: str, symbol: str):
-    """Full analysis for a single coin."""
+def fetch_coins(coin_ids: list) -> dict:
+    """
+    Fetch OHLCV and current price for several coins concurrently.
+    
+    Returns:
+        Dict of coin_id -> (ohlcv, current); failed fetches are None
+    """
+    with ThreadPoolExecutor(max_workers=2 * len(coin_ids)) as executor:
+        futures = {
+            coin_id: (executor.submit(fetch_ohlcv, coin_id, 90), executor.submit(fetch_current_price, coin_id))
+            for coin_id in coin_ids
+        }
+    return {coin_id: (ohlcv.result(), current.result()) for coin_id, (ohlcv, current) in futures.items()}
+
+
+def analyze_coin(coin_id: str, symbol: str, prefetched: tuple = None):
+    """
+    Full analysis for a single coin.
+    
+    Args:
+        coin_id: CoinGecko coin id
+        symbol: Display symbol
+        prefetched: (ohlcv, current) from fetch_coins; fetched here if omitted
+    """
     print(f"\n{'='*60}")
     print(f"📊 Analyzing {symbol}...")
     print(f"{'='*60}")
     
-    # Fetch OHLCV data
-    ohlcv = fetch_ohlcv(coin_id, days=90)
+    ohlcv, current = prefetched or fetch_coins([coin_id])[coin_id]
+    
     if not ohlcv:
         print(f"❌ Failed to fetch OHLCV data for {symbol}")
         return None
     
-    # Fetch current price
-    current = fetch_current_price(coin_id)
     if not current:
         print(f"❌ Failed to fetch current price for {symbol}")
         return None
     
     # Create volume array (approximate from 24h volume)
-    # CoinGecko OHLC doesn't include volume, so we estimate
-    volume = np.ones(len(ohlcv["close"])) * current["volume_24h"] / 24
+    # CoinGecko OHLC doesn't include volume, so we estimate. A constant series
+    # only ever yields a 1.0x volume ratio, so a read-only broadcast view will do.
+    volume = np.broadcast_to(np.float64(current["volume_24h"] / 24), ohlcv["close"].shape)
     
     # Run analysis
     state = analyze_market_v2(
@@ -114,7 +154,7 @@ def analyze_coin(coin_id: str, symbol: str):
     print(f"\n🎯 Regime Detection:")
     print(f"   Regime:   {state.regime}")
     print(f"   Strategy: {state.strategy}")
-    print(f"   Position: {state.position_size_multiplier}x")
+    print(f"   Position: {state.position_size_multiplier:.2f}x")
     
     # Signal with color coding (terminal)
     action_emoji = {"BUY": "🟢", "SELL": "🔴", "HOLD": "⚪"}
@@ -155,9 +195,12 @@ def main():
         ("ethereum", "ETH/USD"),
     ]
     
+    # All round-trips in flight at once; analysis and output stay in order
+    fetched = fetch_coins([coin_id for coin_id, _ in coins])
+    
     results = []
     for coin_id, symbol in coins:
-        result = analyze_coin(coin_id, symbol)
+        result = analyze_coin(coin_id, symbol, fetched[coin_id])
         if result:
             results.append(result)
     
@@ -12,12 +12,25 @@ Usage:
 
 import argparse
 import itertools
+import multiprocessing as mp
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import numpy as np
 
-from signal_engine import SignalEngine, SignalType
+from signal_engine import SignalEngine
+from core._njit import njit
+from data_sources._cache import load_period_candles, save_period_candles
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
 
 # Pair mapping
@@ -26,124 +39,246 @@ PAIRS = {
     'ETH': 'XETHZUSD',
 }
 
+# Backtest settings held fixed while SL/TP/confidence are searched
+STARTING_BALANCE = 10000
+POSITION_SIZE_PCT = 0.10
+LOOKBACK = 50
+
+# Keep-alive connections shared by the concurrent fetches; transient 429/5xx are retried
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET'])
+))
+
+# Fork pool workers on Linux so they inherit the candles, precomputed signals and the
+# compiled _simulate kernel copy-on-write; elsewhere fork is unsafe or missing
+_MP_CONTEXT = mp.get_context('fork') if sys.platform.startswith('linux') else None
+
 
 def fetch_candles(pair: str, interval: int = 60, count: int = 720) -> np.ndarray:
-    """Fetch historical candles from Kraken."""
+    """Fetch historical candles from Kraken (served from the disk cache when fresh)."""
+    cached = load_period_candles(pair, interval, count)
+    if cached is not None:
+        return cached
+    
     kraken_pair = PAIRS.get(pair, pair)
     url = "https://api.kraken.com/0/public/OHLC"
     params = {'pair': kraken_pair, 'interval': interval}
     
     try:
-        response = requests.get(url, params=params, timeout=15)
-        data = response.json()
+        response = _SESSION.get(url, params=params, timeout=15)
+        data = _loads(response.content)
         result = data['result']
-        pair_key = [k for k in result.keys() if k != 'last'][0]
+        pair_key = next(k for k in result if k != 'last')
         candles = result[pair_key][-count:]
-        return np.array([
-            [float(c[0]), float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[6])]
-            for c in candles
-        ])
+        # [time, open, high, low, close, volume] parsed straight into one float64 buffer
+        arr = np.fromiter(
+            itertools.chain.from_iterable((c[0], c[1], c[2], c[3], c[4], c[6]) for c in candles),
+            dtype=np.float64, count=6 * len(candles)
+        ).reshape(-1, 6)
     except Exception as e:
         print(f"❌ Error fetching {pair}: {e}")
         return None
+    
+    # Cached per (pair, interval, count) for the current candle period, shared with backtest.py
+    save_period_candles(pair, interval, count, arr)
+    
+    return arr
 
 
-def run_single_backtest(
-    candles: np.ndarray,
-    engine: SignalEngine,
+@njit(cache=True)
+def _simulate(
+    closes: np.ndarray,
+    signals: np.ndarray,
+    confidences: np.ndarray,
+    lookback: int,
+    balance: float,
+    position_size_pct: float,
     stop_loss_pct: float,
     take_profit_pct: float,
-    min_confidence: float,
-    position_size_pct: float = 0.10,
-    starting_balance: float = 10000,
-    lookback: int = 50
-) -> Dict[str, Any]:
-    """Run a single backtest with given parameters."""
+    min_confidence: float
+):
+    """
+    Walk the bars with precomputed signals, opening on actionable signals
+    and closing on stop loss / take profit. Only the totals are kept.
+    
+    Returns:
+        (final_balance, trades, wins)
+    """
+    n = len(closes)
+    trades = 0
+    wins = 0
     
-    balance = starting_balance
-    position = None
-    trades = []
+    pos_side = 0  # 0 flat, 1 long, -1 short
+    entry_price = 0.0
+    qty = 0.0
     
-    for i in range(lookback, len(candles)):
-        window = candles[i-lookback:i+1]
-        current_price = candles[i, 4]
+    for i in range(lookback, n):
+        current_price = closes[i]
         
         # Check exit
-        if position:
-            pnl_pct = (current_price - position['entry_price']) / position['entry_price']
-            if position['side'] == 'short':
+        if pos_side != 0:
+            pnl_pct = (current_price - entry_price) / entry_price
+            if pos_side == -1:
                 pnl_pct = -pnl_pct
             
-            if pnl_pct <= -stop_loss_pct:
-                pnl = (current_price - position['entry_price']) * position['qty']
-                if position['side'] == 'short':
+            if pnl_pct <= -stop_loss_pct or pnl_pct >= take_profit_pct:
+                pnl = (current_price - entry_price) * qty
+                if pos_side == -1:
                     pnl = -pnl
                 balance += pnl
-                trades.append({'pnl': pnl, 'reason': 'sl'})
-                position = None
-            elif pnl_pct >= take_profit_pct:
-                pnl = (current_price - position['entry_price']) * position['qty']
-                if position['side'] == 'short':
-                    pnl = -pnl
-                balance += pnl
-                trades.append({'pnl': pnl, 'reason': 'tp'})
-                position = None
+                trades += 1
+                if pnl > 0:
+                    wins += 1
+                pos_side = 0
         
         # Check entry
-        if not position:
-            signal = engine.analyze('test', window)
-            if signal.signal != SignalType.NEUTRAL and signal.confidence >= min_confidence:
-                side = 'long' if signal.signal in [SignalType.LONG, SignalType.STRONG_LONG] else 'short'
-                qty = (balance * position_size_pct) / current_price
-                position = {
-                    'side': side,
-                    'entry_price': current_price,
-                    'qty': qty
-                }
+        if pos_side == 0 and signals[i] != 0 and confidences[i] >= min_confidence:
+            pos_side = 1 if signals[i] > 0 else -1
+            qty = (balance * position_size_pct) / current_price
+            entry_price = current_price
     
     # Close remaining position
-    if position:
-        current_price = candles[-1, 4]
-        pnl = (current_price - position['entry_price']) * position['qty']
-        if position['side'] == 'short':
+    if pos_side != 0:
+        current_price = closes[n - 1]
+        pnl = (current_price - entry_price) * qty
+        if pos_side == -1:
             pnl = -pnl
         balance += pnl
-        trades.append({'pnl': pnl, 'reason': 'end'})
+        trades += 1
+        if pnl > 0:
+            wins += 1
+    
+    return balance, trades, wins
+
+
+def run_single_backtest(
+    candles: np.ndarray,
+    engine: Optional[SignalEngine],
+    stop_loss_pct: float,
+    take_profit_pct: float,
+    min_confidence: float,
+    position_size_pct: float = POSITION_SIZE_PCT,
+    starting_balance: float = STARTING_BALANCE,
+    lookback: int = LOOKBACK,
+    precomputed: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    closes: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Run a single backtest with given parameters.
+    
+    When backtesting the same candles repeatedly, pass `precomputed` (the
+    engine.analyze_batch output for these candles; engine is then unused)
+    and `closes` (contiguous float64 close column) to skip per-call setup.
+    """
+    
+    # Signals for every bar in one pass; the native loop only indexes into them
+    if precomputed is None:
+        precomputed = engine.analyze_batch(candles, lookback)
+    signals, confidences = precomputed
+    if closes is None:
+        closes = np.ascontiguousarray(candles[:, 4], dtype=np.float64)
+    
+    balance, trades, wins = _simulate(
+        closes, signals, confidences, lookback,
+        float(starting_balance), float(position_size_pct),
+        float(stop_loss_pct), float(take_profit_pct), float(min_confidence)
+    )
     
     total_pnl = balance - starting_balance
     total_pnl_pct = (total_pnl / starting_balance) * 100
-    wins = len([t for t in trades if t['pnl'] > 0])
     
     return {
         'pnl': total_pnl,
         'pnl_pct': total_pnl_pct,
-        'trades': len(trades),
+        'trades': trades,
         'wins': wins,
-        'win_rate': wins / len(trades) * 100 if trades else 0,
+        'win_rate': wins / trades * 100 if trades else 0,
         'final_balance': balance
     }
 
 
+# Per-worker state, set once by _init_worker so tasks only carry their parameters
+_worker_candles: Dict[str, np.ndarray] = {}
+_worker_signals: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+_worker_closes: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(pair_candles: Dict[str, np.ndarray], pair_signals: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+    """Process pool initializer: keep the candles and their precomputed signals in the worker."""
+    global _worker_candles, _worker_signals, _worker_closes
+    _worker_candles = pair_candles
+    _worker_signals = pair_signals
+    _worker_closes = {
+        pair: np.ascontiguousarray(candles[:, 4], dtype=np.float64)
+        for pair, candles in pair_candles.items()
+    }
+
+
+def _run_combo(combo: Tuple[float, float, float]) -> Tuple[Dict, Dict]:
+    """Backtest one (sl, tp, conf) combination across every pair."""
+    sl, tp, conf = combo
+    
+    # Run backtest for each pair and average
+    total_pnl = 0
+    total_trades = 0
+    total_wins = 0
+    
+    # Only the totals are needed, so call the kernel directly rather than
+    # building run_single_backtest's per-pair result dict
+    for pair in _worker_candles:
+        signals, confidences = _worker_signals[pair]
+        balance, trades, wins = _simulate(
+            _worker_closes[pair], signals, confidences, LOOKBACK,
+            float(STARTING_BALANCE), POSITION_SIZE_PCT, float(sl), float(tp), float(conf)
+        )
+        total_pnl += balance - STARTING_BALANCE
+        total_trades += trades
+        total_wins += wins
+    
+    avg_pnl_pct = (total_pnl / (STARTING_BALANCE * len(_worker_candles))) * 100
+    win_rate = total_wins / total_trades * 100 if total_trades else 0
+    
+    params = {'sl': sl, 'tp': tp, 'conf': conf}
+    result = {
+        'pnl': total_pnl,
+        'pnl_pct': avg_pnl_pct,
+        'trades': total_trades,
+        'win_rate': win_rate
+    }
+    
+    return params, result
+
+
 def optimize(
     pairs: List[str],
     sl_values: List[float],
     tp_values: List[float],
     conf_values: List[float],
-    candle_count: int = 720
+    candle_count: int = 720,
+    workers: Optional[int] = None
 ) -> List[Tuple[Dict, Dict]]:
     """
     Grid search optimization.
     
+    Combinations are backtested in parallel across `workers` processes
+    (default: one per CPU).
+    
     Returns sorted list of (params, results) tuples.
     """
     print("🔬 Parameter Optimizer")
     print("=" * 60)
     
-    # Fetch data
+    # Fetch data for every pair concurrently; the requests are network bound
+    print(f"📥 Fetching {', '.join(pairs)} data...")
+    with ThreadPoolExecutor(max_workers=len(pairs)) as executor:
+        fetched = executor.map(lambda pair: fetch_candles(pair, count=candle_count), pairs)
+    
     pair_candles = {}
-    for pair in pairs:
-        print(f"📥 Fetching {pair} data...")
-        candles = fetch_candles(pair, count=candle_count)
+    for pair, candles in zip(pairs, fetched):
         if candles is not None:
             pair_candles[pair] = candles
     
@@ -151,51 +286,35 @@ def optimize(
         print("❌ No data fetched")
         return []
     
-    # Generate combinations
-    combinations = list(itertools.product(sl_values, tp_values, conf_values))
+    # Generate combinations in grid order, keeping only valid ones (TP should be > SL)
+    sl_grid, tp_grid, conf_grid = np.meshgrid(sl_values, tp_values, conf_values, indexing='ij')
+    valid = tp_grid > sl_grid
+    combinations = np.stack([sl_grid[valid], tp_grid[valid], conf_grid[valid]], axis=1).tolist()
     total = len(combinations)
-    print(f"\n🔄 Testing {total} parameter combinations...")
+    workers = workers or os.cpu_count() or 1
+    print(f"\n🔄 Testing {total} parameter combinations on {workers} workers...")
     
+    # Signals don't depend on SL/TP/confidence: compute them once per pair, not per combination
     engine = SignalEngine()
+    pair_signals = {pair: engine.analyze_batch(candles, LOOKBACK) for pair, candles in pair_candles.items()}
+    
     results = []
     
-    for idx, (sl, tp, conf) in enumerate(combinations):
-        # Skip invalid combinations (TP should be > SL)
-        if tp <= sl:
-            continue
-        
-        # Run backtest for each pair and average
-        total_pnl = 0
-        total_trades = 0
-        total_wins = 0
-        
-        for pair, candles in pair_candles.items():
-            result = run_single_backtest(
-                candles, engine,
-                stop_loss_pct=sl,
-                take_profit_pct=tp,
-                min_confidence=conf
-            )
-            total_pnl += result['pnl']
-            total_trades += result['trades']
-            total_wins += result['wins']
-        
-        avg_pnl_pct = (total_pnl / (10000 * len(pair_candles))) * 100
-        win_rate = total_wins / total_trades * 100 if total_trades else 0
-        
-        params = {'sl': sl, 'tp': tp, 'conf': conf}
-        result = {
-            'pnl': total_pnl,
-            'pnl_pct': avg_pnl_pct,
-            'trades': total_trades,
-            'win_rate': win_rate
-        }
-        
-        results.append((params, result))
-        
-        # Progress
-        if (idx + 1) % 20 == 0:
-            print(f"   Progress: {idx+1}/{total}")
+    if _MP_CONTEXT is not None:
+        # Compile (or load) the kernel once here instead of once per forked worker
+        signals, confidences = next(iter(pair_signals.values()))
+        _simulate(np.ones(len(signals)), signals, confidences, LOOKBACK, 1.0, 0.1, 0.1, 0.1, 0.0)
+    
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT,
+                             initializer=_init_worker, initargs=(pair_candles, pair_signals)) as executor:
+        # map keeps grid order, so equal-PnL combos rank the same on every run
+        chunksize = max(1, total // (workers * 4))
+        for params, result in executor.map(_run_combo, combinations, chunksize=chunksize):
+            results.append((params, result))
+            
+            # Progress
+            if len(results) % 20 == 0:
+                print(f"   Progress: {len(results)}/{total}")
     
     # Sort by PnL
     results.sort(key=lambda x: x[1]['pnl'], reverse=True)
@@ -205,20 +324,25 @@ def optimize(
 
 def print_results(results: List[Tuple[Dict, Dict]], top_n: int = 10):
     """Print top optimization results."""
-    print(f"\n{'='*70}")
-    print(f"🏆 TOP {top_n} PARAMETER COMBINATIONS")
-    print(f"{'='*70}")
-    print(f"{'Rank':<5} {'SL%':<6} {'TP%':<6} {'Conf':<6} {'PnL%':<10} {'Trades':<8} {'Win%':<8}")
-    print("-" * 70)
+    # Collected and written in one call rather than a print per row
+    lines = [
+        f"\n{'='*70}",
+        f"🏆 TOP {top_n} PARAMETER COMBINATIONS",
+        f"{'='*70}",
+        f"{'Rank':<5} {'SL%':<6} {'TP%':<6} {'Conf':<6} {'PnL%':<10} {'Trades':<8} {'Win%':<8}",
+        "-" * 70,
+    ]
     
     for i, (params, result) in enumerate(results[:top_n], 1):
-        print(f"{i:<5} {params['sl']*100:<6.0f} {params['tp']*100:<6.0f} {params['conf']:<6.0f} {result['pnl_pct']:<10.2f} {result['trades']:<8} {result['win_rate']:<8.1f}")
+        lines.append(f"{i:<5} {params['sl']*100:<6.0f} {params['tp']*100:<6.0f} {params['conf']:<6.0f} {result['pnl_pct']:<10.2f} {result['trades']:<8} {result['win_rate']:<8.1f}")
     
     # Best result
     if results:
         best_params, best_result = results[0]
-        print(f"\n✨ BEST: SL={best_params['sl']*100:.0f}%, TP={best_params['tp']*100:.0f}%, Conf={best_params['conf']:.0f}")
-        print(f"   PnL: {best_result['pnl_pct']:.2f}% | Trades: {best_result['trades']} | Win: {best_result['win_rate']:.1f}%")
+        lines.append(f"\n✨ BEST: SL={best_params['sl']*100:.0f}%, TP={best_params['tp']*100:.0f}%, Conf={best_params['conf']:.0f}")
+        lines.append(f"   PnL: {best_result['pnl_pct']:.2f}% | Trades: {best_result['trades']} | Win: {best_result['win_rate']:.1f}%")
+    
+    print("\n".join(lines))
 
 
 def main():
@@ -226,6 +350,7 @@ def main():
     parser.add_argument('--extensive', action='store_true', help='More combinations')
     parser.add_argument('--pair', type=str, help='Single pair to test')
     parser.add_argument('--candles', type=int, default=720, help='Number of candles')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
     
     args = parser.parse_args()
     
@@ -241,7 +366,7 @@ def main():
     
     pairs = [args.pair] if args.pair else ['BTC', 'ETH']
     
-    results = optimize(pairs, sl_values, tp_values, conf_values, args.candles)
+    results = optimize(pairs, sl_values, tp_values, conf_values, args.candles, args.workers)
     print_results(results)
 
 
@@ -6,6 +6,7 @@ Each strategy votes, and we combine their signals with configurable weights.
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
@@ -20,6 +21,18 @@ class SignalType(Enum):
     STRONG_SHORT = -2
 
 
+# Signal groupings and labels, built once rather than per comparison
+LONG_SIGNALS = frozenset((SignalType.LONG, SignalType.STRONG_LONG))
+
+ALERT_SIDES = {
+    SignalType.STRONG_LONG: 'STRONG BUY',
+    SignalType.LONG: 'BUY',
+    SignalType.NEUTRAL: 'HOLD',
+    SignalType.SHORT: 'SELL',
+    SignalType.STRONG_SHORT: 'STRONG SELL'
+}
+
+
 @dataclass
 class StrategySignal:
     """Output from a single strategy."""
@@ -42,19 +55,12 @@ class CompositeSignal:
     
     def to_alert_dict(self) -> Dict[str, Any]:
         """Convert to dict format for Discord alerts."""
-        side_map = {
-            SignalType.STRONG_LONG: 'STRONG BUY',
-            SignalType.LONG: 'BUY',
-            SignalType.NEUTRAL: 'HOLD',
-            SignalType.SHORT: 'SELL',
-            SignalType.STRONG_SHORT: 'STRONG SELL'
-        }
         return {
             'symbol': self.symbol,
-            'side': side_map[self.signal],
+            'side': ALERT_SIDES[self.signal],
             'price': self.price,
             'confidence': round(self.confidence),
-            'strategy': ', '.join([s.name for s in self.strategies if s.signal != SignalType.NEUTRAL]),
+            'strategy': ', '.join([s.name for s in self.strategies if s.signal is not SignalType.NEUTRAL]),
             'rsi': next((s.indicators.get('rsi') for s in self.strategies if 'rsi' in s.indicators), None)
         }
 
@@ -358,10 +364,210 @@ class SignalEngine:
             strategies=strategies,
             timestamp=datetime.now()
         )
+    
+    # === BATCH (BACKTESTING) ===
+    #
+    # Vectorized versions of the strategies above. Each returns arrays indexed
+    # by bar: entry i holds what analyze() would return for the trailing
+    # window candles[i-lookback:i+1]. Entries before `lookback` are unused.
+    
+    @staticmethod
+    def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+        """Mean of each trailing `period`-value window, aligned to its last value."""
+        out = np.full(len(values), np.nan)
+        if len(values) >= period:
+            out[period-1:] = sliding_window_view(values, period).mean(axis=1)
+        return out
+    
+    @staticmethod
+    def _windowed_ema(closes: np.ndarray, period: int, length: int) -> np.ndarray:
+        """
+        calculate_ema() of every trailing `length`-bar window, aligned to its last bar.
+        
+        Steps every window through the same recursion as calculate_ema(), one
+        bar position at a time, so results round identically. (A convolution
+        with the closed-form weights is off by ~1e-14, enough to flip the
+        strict EMA comparisons on flat prices.)
+        """
+        if length < period:
+            return closes.astype(np.float64)
+        
+        multiplier = 2 / (period + 1)
+        
+        out = np.full(len(closes), np.nan)
+        if len(closes) >= length:
+            windows = sliding_window_view(closes, length)
+            ema = windows[:, 0].astype(np.float64)
+            for k in range(1, length):
+                ema = (windows[:, k] * multiplier) + (ema * (1 - multiplier))
+            out[length-1:] = ema
+        return out
+    
+    def batch_rsi_mean_reversion(self, candles: np.ndarray, lookback: int) -> tuple:
+        """Vectorized strategy_rsi_mean_reversion over every window."""
+        closes = candles[:, 4]
+        n = len(closes)
+        period, bb_period = 14, 20
+        
+        if lookback + 1 >= period + 1:
+            deltas = np.diff(closes)
+            avg_gain = np.full(n, np.nan)
+            avg_loss = np.full(n, np.nan)
+            avg_gain[1:] = self._rolling_mean(np.where(deltas > 0, deltas, 0), period)
+            avg_loss[1:] = self._rolling_mean(np.where(deltas < 0, -deltas, 0), period)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rsi = np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+        else:
+            rsi = np.full(n, 50.0)
+        
+        if lookback + 1 >= bb_period:
+            windows = sliding_window_view(closes, bb_period)
+            bb_mid = np.full(n, np.nan)
+            std_dev = np.full(n, np.nan)
+            bb_mid[bb_period-1:] = windows.mean(axis=1)
+            std_dev[bb_period-1:] = windows.std(axis=1)
+            bb_upper = bb_mid + (2 * std_dev)
+            bb_lower = bb_mid - (2 * std_dev)
+        else:
+            bb_upper = bb_mid = bb_lower = closes
+        
+        conditions = [
+            (rsi < 30) & (closes < bb_lower),
+            (rsi < 35) & (closes < bb_mid),
+            (rsi > 70) & (closes > bb_upper),
+            (rsi > 65) & (closes > bb_mid),
+        ]
+        signal = np.select(conditions, [2, 1, -2, -1], 0)
+        confidence = np.select(conditions, [80 + (30 - rsi), 60 + (35 - rsi), 80 + (rsi - 70), 60 + (rsi - 65)], 50.0)
+        return signal, np.minimum(confidence, 100)
+    
+    def batch_golden_cross(self, candles: np.ndarray, lookback: int) -> tuple:
+        """Vectorized strategy_golden_cross over every window."""
+        closes = candles[:, 4]
+        length = lookback + 1
+        
+        fast_ema = self._windowed_ema(closes, 8, length)
+        slow_ema = self._windowed_ema(closes, 21, length)
+        
+        # Previous values come from the same window minus its last bar
+        prev_fast = np.full(len(closes), np.nan)
+        prev_slow = np.full(len(closes), np.nan)
+        prev_fast[1:] = self._windowed_ema(closes, 8, length - 1)[:-1]
+        prev_slow[1:] = self._windowed_ema(closes, 21, length - 1)[:-1]
+        
+        conditions = [
+            (prev_fast <= prev_slow) & (fast_ema > slow_ema),
+            (prev_fast >= prev_slow) & (fast_ema < slow_ema),
+            fast_ema > slow_ema,
+            fast_ema < slow_ema,
+        ]
+        signal = np.select(conditions, [1, -1, 1, -1], 0)
+        confidence = np.select(conditions, [70.0, 70.0, 55.0, 55.0], 50.0)
+        return signal, confidence
+    
+    def batch_macd(self, candles: np.ndarray, lookback: int) -> tuple:
+        """Vectorized strategy_macd over every window."""
+        closes = candles[:, 4]
+        length = lookback + 1
+        
+        macd_line = self._windowed_ema(closes, 12, length) - self._windowed_ema(closes, 26, length)
+        signal_line = macd_line * 0.9
+        histogram = macd_line - signal_line
+        
+        conditions = [
+            (histogram > 0) & (macd_line > 0),
+            (histogram < 0) & (macd_line < 0),
+        ]
+        strength = 60 + np.minimum(np.abs(histogram) * 10, 30)
+        signal = np.select(conditions, [1, -1], 0)
+        confidence = np.select(conditions, [strength, strength], 50.0)
+        return signal, np.minimum(confidence, 100)
+    
+    def batch_volume_breakout(self, candles: np.ndarray, lookback: int) -> tuple:
+        """Vectorized strategy_volume_breakout over every window."""
+        closes = candles[:, 4]
+        volumes = candles[:, 5]
+        n = len(closes)
+        
+        if lookback + 1 < 20:
+            return np.zeros(n, dtype=np.int64), np.full(n, 50.0)
+        
+        # Average of the 19 bars before the current one
+        avg_vol = np.full(n, np.nan)
+        avg_vol[1:] = self._rolling_mean(volumes, 19)[:-1]
+        prev_close = np.full(n, np.nan)
+        prev_close[1:] = closes[:-1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vol_ratio = np.where(avg_vol > 0, volumes / avg_vol, 1.0)
+            price_change = np.where(prev_close > 0, (closes - prev_close) / prev_close, 0)
+        
+        conditions = [
+            (vol_ratio > 2.0) & (price_change > 0.01),
+            (vol_ratio > 1.5) & (price_change > 0.005),
+            (vol_ratio > 2.0) & (price_change < -0.01),
+            (vol_ratio > 1.5) & (price_change < -0.005),
+        ]
+        strong = 75 + np.minimum(vol_ratio * 5, 20)
+        weak = 60 + np.minimum(vol_ratio * 5, 20)
+        signal = np.select(conditions, [2, 1, -2, -1], 0)
+        confidence = np.select(conditions, [strong, weak, strong, weak], 50.0)
+        return signal, np.minimum(confidence, 100)
+    
+    def analyze_batch(self, candles: np.ndarray, lookback: int = 50) -> tuple:
+        """
+        Composite signal for every bar at once.
+        
+        Equivalent to calling analyze() on candles[i-lookback:i+1] for each
+        i >= lookback, but computes each indicator in a single NumPy pass.
+        
+        Args:
+            candles: OHLCV data as numpy array [time, open, high, low, close, volume]
+            lookback: Bars of history before the current one in each window
+        
+        Returns:
+            (signals, confidences) arrays of length len(candles); signals hold
+            SignalType values. Entries before `lookback` are NEUTRAL / 0.
+        """
+        n = len(candles)
+        strategies = [
+            ("RSI Mean Reversion", self.batch_rsi_mean_reversion(candles, lookback)),
+            ("Golden Cross", self.batch_golden_cross(candles, lookback)),
+            ("MACD", self.batch_macd(candles, lookback)),
+            ("Volume Breakout", self.batch_volume_breakout(candles, lookback)),
+        ]
+        
+        total_weight = 0
+        weighted_signal = np.zeros(n)
+        weighted_confidence = np.zeros(n)
+        
+        for name, (signal, confidence) in strategies:
+            weight = self.weights.get(name, self.default_weight)
+            weighted_signal += signal * weight * (confidence / 100)
+            weighted_confidence += confidence * weight
+            total_weight += weight
+        
+        if total_weight > 0:
+            avg_signal = weighted_signal / total_weight
+            avg_confidence = weighted_confidence / total_weight
+        else:
+            avg_signal = np.zeros(n)
+            avg_confidence = np.full(n, 50.0)
+        
+        signals = np.select(
+            [avg_signal >= 1.5, avg_signal >= 0.5, avg_signal <= -1.5, avg_signal <= -0.5],
+            [SignalType.STRONG_LONG.value, SignalType.LONG.value, SignalType.STRONG_SHORT.value, SignalType.SHORT.value],
+            SignalType.NEUTRAL.value
+        ).astype(np.int8)
+        signals[:lookback] = SignalType.NEUTRAL.value
+        avg_confidence[:lookback] = 0.0
+        
+        return signals, avg_confidence
 
 
 if __name__ == '__main__':
     # Test with sample data
+    from itertools import chain
     import requests
     
     def fetch_candles(symbol='XXBTZUSD', interval=60, count=100):
@@ -374,10 +580,13 @@ if __name__ == '__main__':
             return None
         
         result = data['result']
-        pair_key = [k for k in result.keys() if k != 'last'][0]
+        pair_key = next(k for k in result if k != 'last')
         candles = result[pair_key][-count:]
         
-        return np.array([[float(c[0]), float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[6])] for c in candles])
+        return np.fromiter(
+            chain.from_iterable((c[0], c[1], c[2], c[3], c[4], c[6]) for c in candles),
+            dtype=np.float64, count=6 * len(candles)
+        ).reshape(-1, 6)
     
     print("🔍 Signal Engine Test")
     print("=" * 50)
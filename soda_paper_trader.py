@@ -9,11 +9,23 @@ Paper trading only - no real money.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import numpy as np
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import chain
 import json
 
+from core._njit import njit
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 # Configuration
 CONFIG = {
     'pairs': ['XXBTZUSD', 'XETHZUSD'],  # BTC/USD, ETH/USD
@@ -30,6 +42,9 @@ CONFIG = {
     'take_profit_pct': 0.05,
 }
 
+STATE_FILE = 'soda_paper_state.json'
+TRADES_LOG = 'soda_paper_trades.jsonl'  # Append-only record of every entry and exit
+
 # State
 state = {
     'balance': CONFIG['starting_balance'],
@@ -38,6 +53,21 @@ state = {
     'start_time': datetime.now().isoformat(),
 }
 
+# Keep-alive connections shared by the concurrent fetches; transient 429/5xx are retried
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET'])
+))
+
+# Rolling RSI/BB windows per symbol, advanced once per closed candle
+_indicator_state = {}
+
+# Last full candle fetch per symbol; until the next candle opens only its last close is refreshed
+_candles = {}
+
 
 def fetch_candles(symbol, interval=60, count=100):
     """Fetch candles from Kraken public API."""
@@ -45,49 +75,239 @@ def fetch_candles(symbol, interval=60, count=100):
     params = {'pair': symbol, 'interval': interval}
     
     try:
-        response = requests.get(url, params=params, timeout=10)
-        data = response.json()
+        response = _SESSION.get(url, params=params, timeout=10)
+        data = _loads(response.content)
         
         if data.get('error') and len(data['error']) > 0:
             print(f"  ❌ Kraken API Error: {data['error']}")
             return None
         
         result = data['result']
-        pair_key = [k for k in result.keys() if k != 'last'][0]
+        pair_key = next(k for k in result if k != 'last')
         candles = result[pair_key][-count:]
         
-        # Convert to numpy: [time, open, high, low, close, volume]
-        return np.array([[float(c[0]), float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[6])] for c in candles])
+        # Convert to numpy: [time, open, high, low, close, volume], parsed straight into one float64 buffer.
+        # Not float32: unix times would round to 128s steps and break the rolling indicators' bar matching.
+        return np.fromiter(
+            chain.from_iterable((c[0], c[1], c[2], c[3], c[4], c[6]) for c in candles),
+            dtype=np.float64, count=6 * len(candles)
+        ).reshape(-1, 6)
     except Exception as e:
         print(f"  ❌ Fetch error: {e}")
         return None
 
 
-def calculate_rsi(closes, period=14):
-    """Calculate RSI."""
-    deltas = np.diff(closes)
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
+def fetch_all(symbols, interval=60, count=100):
+    """Fetch candles for several symbols concurrently. Failed fetches map to None."""
+    if not symbols:
+        return {}
     
-    avg_gain = np.mean(gains[-period:])
-    avg_loss = np.mean(losses[-period:])
+    with ThreadPoolExecutor(max_workers=len(symbols)) as executor:
+        futures = {symbol: executor.submit(fetch_candles, symbol, interval, count) for symbol in symbols}
+    return {symbol: future.result() for symbol, future in futures.items()}
+
+
+def fetch_tickers(symbols):
+    """Fetch last trade prices for several symbols in one Kraken Ticker request."""
+    url = "https://api.kraken.com/0/public/Ticker"
+    params = {'pair': ','.join(symbols)}
     
-    if avg_loss == 0:
-        return 100
+    try:
+        response = _SESSION.get(url, params=params, timeout=10)
+        data = _loads(response.content)
+        
+        if data.get('error') and len(data['error']) > 0:
+            print(f"  ❌ Kraken API Error: {data['error']}")
+            return {}
+        
+        # Results are keyed by Kraken's canonical pair names, as used in CONFIG['pairs']
+        result = data['result']
+        return {symbol: float(result[symbol]['c'][0]) for symbol in symbols if symbol in result}
+    except Exception as e:
+        print(f"  ❌ Ticker error: {e}")
+        return {}
+
+
+def scan_candles(symbols):
+    """
+    Candles for each symbol, re-downloading the OHLC history only when a new candle has opened.
+    
+    In between, one Ticker request refreshes the forming candle's close, which
+    is all the indicators need from it. Symbols that could not be updated map to None.
+    """
+    now = time.time()
+    interval_s = CONFIG['interval'] * 60
+    stale = [s for s in symbols if s not in _candles or now >= _candles[s][-1, 0] + interval_s]
+    
+    for symbol, candles in fetch_all(stale, CONFIG['interval']).items():
+        if candles is None:
+            _candles.pop(symbol, None)
+        else:
+            _candles[symbol] = candles
+    
+    live = [s for s in symbols if s not in stale]
+    prices = fetch_tickers(live) if live else {}
+    for symbol, price in prices.items():
+        last = _candles[symbol][-1]
+        last[4] = price
+        last[2] = max(last[2], price)
+        last[3] = min(last[3], price)
+    
+    return {s: _candles[s] if s in _candles and (s in stale or s in prices) else None for s in symbols}
+
+
+@njit(cache=True)
+def _rsi_last(closes, period):
+    """RSI of the last close from the mean gain/loss over the last `period` deltas."""
+    n = closes.shape[0]
+    gain = 0.0
+    loss = 0.0
+    for i in range(max(1, n - period), n):
+        delta = closes[i] - closes[i - 1]
+        if delta > 0:
+            gain += delta
+        else:
+            loss -= delta
+    
+    # Both means share the same divisor, so the sums' ratio is the RS
+    if loss == 0:
+        return 100.0
+    return 100.0 - (100.0 / (1.0 + gain / loss))
+
+
+@njit(cache=True)
+def _bbands_last(closes, period, std):
+    """(upper, mid, lower) Bollinger Bands over the last `period` closes."""
+    n = closes.shape[0]
+    start = max(0, n - period)
+    count = n - start
+    
+    total = 0.0
+    for i in range(start, n):
+        total += closes[i]
+    sma = total / count
     
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+    sq = 0.0
+    for i in range(start, n):
+        dev = closes[i] - sma
+        sq += dev * dev
+    std_dev = np.sqrt(sq / count)
+    
+    return sma + std * std_dev, sma, sma - std * std_dev
+
+
+def calculate_rsi(closes, period=14):
+    """Calculate RSI."""
+    return _rsi_last(np.ascontiguousarray(closes[-period - 1:], dtype=np.float64), period)
 
 
 def calculate_bollinger_bands(closes, period=20, std=2):
     """Calculate Bollinger Bands."""
-    sma = np.mean(closes[-period:])
-    std_dev = np.std(closes[-period:])
+    return _bbands_last(np.ascontiguousarray(closes[-period:], dtype=np.float64), period, float(std))
+
+
+def _seed_indicators(times, closes):
+    """Build rolling RSI/BB state from a run of closed candles."""
+    rsi_n = CONFIG['rsi_period'] - 1
+    bb_n = CONFIG['bb_period'] - 1
+    
+    deltas = np.diff(closes)[-rsi_n:]
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    # BB sums are taken around the seed close so sum_sq doesn't swamp the variance
+    ref = float(closes[-1])
+    window = closes[-bb_n:] - ref
+    
+    return {
+        'time': times[-1],
+        'last_close': float(closes[-1]),
+        'gains': deque(gains.tolist(), maxlen=rsi_n),
+        'losses': deque(losses.tolist(), maxlen=rsi_n),
+        'gain_sum': float(gains.sum()),
+        'loss_sum': float(losses.sum()),
+        'ref': ref,
+        'closes': deque(window.tolist(), maxlen=bb_n),
+        'sum': float(window.sum()),
+        'sum_sq': float(np.dot(window, window)),
+    }
+
+
+def _advance_indicators(ind, time_, close):
+    """Slide the rolling windows forward by one closed candle."""
+    delta = close - ind['last_close']
+    gain = delta if delta > 0 else 0.0
+    loss = -delta if delta < 0 else 0.0
+    
+    if len(ind['gains']) == ind['gains'].maxlen:
+        ind['gain_sum'] -= ind['gains'][0]
+        ind['loss_sum'] -= ind['losses'][0]
+    ind['gains'].append(gain)
+    ind['losses'].append(loss)
+    ind['gain_sum'] += gain
+    ind['loss_sum'] += loss
     
-    upper = sma + (std * std_dev)
-    lower = sma - (std * std_dev)
+    if len(ind['closes']) == ind['closes'].maxlen:
+        oldest = ind['closes'][0]
+        ind['sum'] -= oldest
+        ind['sum_sq'] -= oldest * oldest
+    shifted = close - ind['ref']
+    ind['closes'].append(shifted)
+    ind['sum'] += shifted
+    ind['sum_sq'] += shifted * shifted
     
-    return upper, sma, lower
+    ind['time'] = time_
+    ind['last_close'] = close
+
+
+def rolling_indicators(symbol, candles):
+    """
+    RSI and Bollinger Bands for the latest candle, without rescanning the window.
+    
+    The last candle is still forming, so state covers closed candles only and
+    is advanced once per newly closed bar; the forming close is folded in on
+    top. Same values as calculate_rsi / calculate_bollinger_bands on the full
+    close series.
+    
+    Returns:
+        (rsi, bb_upper, bb_mid, bb_lower)
+    """
+    times = candles[:, 0]
+    closes = candles[:, 4]
+    rsi_period = CONFIG['rsi_period']
+    bb_period = CONFIG['bb_period']
+    
+    if len(closes) <= max(rsi_period, bb_period):
+        bb_upper, bb_mid, bb_lower = calculate_bollinger_bands(closes, bb_period, CONFIG['bb_std'])
+        return calculate_rsi(closes, rsi_period), bb_upper, bb_mid, bb_lower
+    
+    ind = _indicator_state.get(symbol)
+    last_closed = len(times) - 1
+    start = np.searchsorted(times, ind['time']) if ind is not None else last_closed
+    
+    if start >= last_closed or times[start] != ind['time']:
+        # First call, or the fetch no longer overlaps our state: reseed
+        ind = _indicator_state[symbol] = _seed_indicators(times[:-1], closes[:-1])
+    else:
+        for i in range(start + 1, last_closed):
+            _advance_indicators(ind, times[i], float(closes[i]))
+    
+    current_price = float(closes[-1])
+    
+    delta = current_price - ind['last_close']
+    avg_gain = (ind['gain_sum'] + max(delta, 0.0)) / rsi_period
+    avg_loss = (ind['loss_sum'] + max(-delta, 0.0)) / rsi_period
+    if avg_loss == 0:
+        rsi = 100
+    else:
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    
+    shifted = current_price - ind['ref']
+    mean = (ind['sum'] + shifted) / bb_period
+    variance = (ind['sum_sq'] + shifted * shifted) / bb_period - mean * mean
+    std_dev = np.sqrt(max(variance, 0.0))
+    sma = ind['ref'] + mean
+    
+    return rsi, sma + CONFIG['bb_std'] * std_dev, sma, sma - CONFIG['bb_std'] * std_dev
 
 
 def check_signals(symbol, candles):
@@ -95,8 +315,7 @@ def check_signals(symbol, candles):
     closes = candles[:, 4]  # Close prices
     current_price = closes[-1]
     
-    rsi = calculate_rsi(closes, CONFIG['rsi_period'])
-    bb_upper, bb_mid, bb_lower = calculate_bollinger_bands(closes, CONFIG['bb_period'], CONFIG['bb_std'])
+    rsi, bb_upper, bb_mid, bb_lower = rolling_indicators(symbol, candles)
     
     signal = None
     
@@ -128,12 +347,13 @@ def execute_paper_trade(signal_data):
     
     position_value = state['balance'] * CONFIG['position_size_pct']
     qty = position_value / price
+    now = datetime.now().isoformat()
     
     state['positions'][symbol] = {
         'entry_price': price,
         'qty': qty,
         'side': signal.lower(),
-        'entry_time': datetime.now().isoformat()
+        'entry_time': now
     }
     
     trade = {
@@ -141,21 +361,56 @@ def execute_paper_trade(signal_data):
         'side': signal,
         'entry_price': price,
         'qty': qty,
-        'time': datetime.now().isoformat()
+        'time': now
     }
     state['trades'].append(trade)
+    log_trade(trade)
     
     print(f"  🎯 PAPER TRADE: {signal} {symbol} @ ${price:,.2f} (qty: {qty:.6f})")
 
 
-def check_exits():
-    """Check stop loss and take profit for open positions."""
-    for symbol, pos in list(state['positions'].items()):
-        candles = fetch_candles(symbol, CONFIG['interval'], 10)
-        if candles is None:
+def log_trade(trade):
+    """Append one trade event to the trade log."""
+    try:
+        with open(TRADES_LOG, 'a') as f:
+            f.write(json.dumps(trade) + '\n')
+    except OSError as e:
+        print(f"  ⚠️  Could not log trade: {e}")
+
+
+def save_state():
+    """Persist balance and open positions; the trade history lives in TRADES_LOG."""
+    snapshot = {
+        'balance': state['balance'],
+        'positions': state['positions'],
+        'start_time': state['start_time'],
+    }
+    with open(STATE_FILE, 'w') as f:
+        json.dump(snapshot, f, indent=2)
+
+
+def check_exits(prices=None):
+    """
+    Check stop loss and take profit for open positions.
+    
+    Args:
+        prices: Latest price per symbol from this tick's scan; positions
+            missing from it are priced with one Ticker request.
+    """
+    positions = list(state['positions'].items())
+    if not positions:
+        return
+    
+    prices = dict(prices or {})
+    missing = [symbol for symbol, _ in positions if symbol not in prices]
+    if missing:
+        prices.update(fetch_tickers(missing))
+    
+    for symbol, pos in positions:
+        current_price = prices.get(symbol)
+        if current_price is None:
             continue
         
-        current_price = candles[-1, 4]
         entry_price = pos['entry_price']
         side = pos['side']
         
@@ -182,54 +437,76 @@ def close_position(symbol, exit_price, reason):
     
     state['balance'] += pnl
     
+    log_trade({
+        'symbol': symbol,
+        'side': pos['side'].upper(),
+        'exit_price': exit_price,
+        'pnl': pnl,
+        'reason': reason,
+        'time': datetime.now().isoformat()
+    })
+    
     print(f"  📊 Closed {symbol}: PnL ${pnl:,.2f} | New Balance: ${state['balance']:,.2f}")
 
 
 def print_status():
     """Print current bot status."""
-    print(f"\n{'='*60}")
-    print(f"🥤 SodaPoppy Mean Reversion Bot - {datetime.now().strftime('%H:%M:%S')}")
-    print(f"{'='*60}")
-    print(f"💰 Balance: ${state['balance']:,.2f}")
-    print(f"📈 Open Positions: {len(state['positions'])}")
-    print(f"📊 Total Trades: {len(state['trades'])}")
-    print()
+    # Built up and written in one call rather than a print per line
+    print("\n".join((
+        f"\n{'='*60}",
+        f"🥤 SodaPoppy Mean Reversion Bot - {datetime.now().strftime('%H:%M:%S')}",
+        f"{'='*60}",
+        f"💰 Balance: ${state['balance']:,.2f}",
+        f"📈 Open Positions: {len(state['positions'])}",
+        f"📊 Total Trades: {len(state['trades'])}",
+        "",
+    )))
 
 
 def run_bot():
     """Main bot loop."""
-    print("🚀 Starting SodaPoppy Paper Trading Bot")
-    print(f"   Strategy: Mean Reversion (RSI + Bollinger Bands)")
-    print(f"   Pairs: {CONFIG['pairs']}")
-    print(f"   Starting Balance: ${CONFIG['starting_balance']:,}")
-    print()
+    print("\n".join((
+        "🚀 Starting SodaPoppy Paper Trading Bot",
+        "   Strategy: Mean Reversion (RSI + Bollinger Bands)",
+        f"   Pairs: {CONFIG['pairs']}",
+        f"   Starting Balance: ${CONFIG['starting_balance']:,}",
+        "",
+    )))
+    
+    # Compile (or load from cache) the indicator kernels before the first scan
+    warmup = np.linspace(1.0, 2.0, CONFIG['bb_period'] + 1)
+    calculate_rsi(warmup, CONFIG['rsi_period'])
+    calculate_bollinger_bands(warmup, CONFIG['bb_period'], CONFIG['bb_std'])
     
     while True:
         try:
             print_status()
             
+            # One fetch per tick serves both the exit checks and the signal scan
+            all_candles = scan_candles(CONFIG['pairs'])
+            
             # Check exits first
-            check_exits()
+            check_exits({pair: candles[-1, 4] for pair, candles in all_candles.items() if candles is not None})
             
             # Check for new signals
             for pair in CONFIG['pairs']:
-                print(f"  📡 Scanning {pair}...")
-                candles = fetch_candles(pair, CONFIG['interval'])
+                candles = all_candles[pair]
                 
                 if candles is None:
+                    print(f"  📡 Scanning {pair}...")
                     continue
                 
                 signal_data = check_signals(pair, candles)
                 
-                print(f"     Price: ${signal_data['price']:,.2f} | RSI: {signal_data['rsi']} | BB: [{signal_data['bb_lower']:,.0f} - {signal_data['bb_upper']:,.0f}]")
+                print(f"  📡 Scanning {pair}...\n"
+                      f"     Price: ${signal_data['price']:,.2f} | RSI: {signal_data['rsi']} | BB: [{signal_data['bb_lower']:,.0f} - {signal_data['bb_upper']:,.0f}]")
                 
                 if signal_data['signal']:
                     print(f"  🔔 SIGNAL: {signal_data['signal']}!")
                     execute_paper_trade(signal_data)
             
             # Save state
-            with open('soda_paper_state.json', 'w') as f:
-                json.dump(state, f, indent=2)
+            save_state()
             
             print(f"\n  ⏳ Next check in {CONFIG['check_interval']}s...")
             time.sleep(CONFIG['check_interval'])
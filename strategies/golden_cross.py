@@ -22,21 +22,41 @@ from jesse import utils
 
 class GoldenCross(Strategy):
     
+    def __init__(self):
+        super().__init__()
+        # EMA values keyed by (period, timestamp of the window's last candle)
+        self._ema_cache = {}
+    
+    def _ema(self, period: int, prev: bool = False) -> float:
+        """EMA at the current (or previous) bar, computed at most once per bar."""
+        candles = self.candles[:-1] if prev else self.candles
+        key = (period, candles[-1, 0])
+        value = self._ema_cache.get(key)
+        if value is None:
+            value = self._ema_cache[key] = ta.ema(candles, period=period)
+        return value
+    
+    def before(self):
+        # This bar's prev_* EMAs are the last bar's current ones; anything older is stale
+        if len(self.candles) > 1:
+            prev_ts = self.candles[-2, 0]
+            self._ema_cache = {k: v for k, v in self._ema_cache.items() if k[1] >= prev_ts}
+    
     @property
     def fast_ema(self):
-        return ta.ema(self.candles, period=8)
+        return self._ema(8)
     
     @property
     def slow_ema(self):
-        return ta.ema(self.candles, period=21)
+        return self._ema(21)
     
     @property
     def prev_fast_ema(self):
-        return ta.ema(self.candles[:-1], period=8)
+        return self._ema(8, prev=True)
     
     @property
     def prev_slow_ema(self):
-        return ta.ema(self.candles[:-1], period=21)
+        return self._ema(21, prev=True)
     
     def should_long(self) -> bool:
         # Golden cross: fast EMA crosses above slow EMA
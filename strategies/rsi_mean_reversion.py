@@ -22,13 +22,25 @@ from jesse import utils
 
 class RSIMeanReversion(Strategy):
     
+    def __init__(self):
+        super().__init__()
+        # Indicator values for the current bar, cleared in before()
+        self._cache = {}
+    
+    def before(self):
+        self._cache = {}
+    
     @property
     def rsi(self):
-        return ta.rsi(self.candles, period=14)
+        if 'rsi' not in self._cache:
+            self._cache['rsi'] = ta.rsi(self.candles, period=14)
+        return self._cache['rsi']
     
     @property
     def bb(self):
-        return ta.bollinger_bands(self.candles, period=20, devup=2, devdn=2)
+        if 'bb' not in self._cache:
+            self._cache['bb'] = ta.bollinger_bands(self.candles, period=20, devup=2, devdn=2)
+        return self._cache['bb']
     
     @property
     def bb_lower(self):
@@ -0,0 +1,43 @@
+"""analyze_batch must agree with per-window analyze() bar for bar."""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from signal_engine import SignalEngine
+
+
+def _candles(closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+    n = len(closes)
+    return np.column_stack([np.arange(n) * 3600.0, closes, closes + 1, closes - 1, closes, volumes])
+
+
+def test_batch_matches_analyze_on_flat_window():
+    rng = np.random.default_rng(0)
+    closes = 100 + np.cumsum(rng.normal(0, 1, 400))
+    closes[150:250] = closes[150]
+    candles = _candles(closes, rng.uniform(1, 10, 400))
+    engine = SignalEngine()
+    lookback = 50
+    
+    batches = [
+        (engine.batch_rsi_mean_reversion, engine.strategy_rsi_mean_reversion),
+        (engine.batch_golden_cross, engine.strategy_golden_cross),
+        (engine.batch_macd, engine.strategy_macd),
+        (engine.batch_volume_breakout, engine.strategy_volume_breakout),
+    ]
+    for batch, strategy in batches:
+        signals, confidences = batch(candles, lookback)
+        for i in range(lookback, len(candles)):
+            result = strategy(candles[i-lookback:i+1])
+            assert signals[i] == result.signal.value, (result.name, i)
+            assert confidences[i] == result.confidence, (result.name, i)
+    
+    signals, confidences = engine.analyze_batch(candles, lookback)
+    for i in range(lookback, len(candles)):
+        result = engine.analyze('TEST', candles[i-lookback:i+1])
+        assert signals[i] == result.signal.value, i
+        assert confidences[i] == result.confidence, i